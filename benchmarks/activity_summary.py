@@ -0,0 +1,65 @@
+# Summarize a synthetic month of activity logs, serial vs one process per core:
+#   python -m benchmarks.activity_summary --days 30 --events 50000
+import argparse
+import json
+import os
+import random
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from core.activity_summary import merge, summarize_days
+
+PC_APPS = ["Code", "Chrome", "Slack", "Terminal", "Spotify", "Explorer"]
+PHONE_APPS = ["None", "com.whatsapp", "com.instagram.android", "com.ido.noise"]
+
+
+def write_day(folder, day, events, rng):
+    path = folder / f"activity_log_{day:%Y-%m-%d}.jsonl"
+    ts = day.timestamp()
+    with open(path, "w", encoding="utf-8") as f:
+        for _ in range(events):
+            ts += rng.uniform(1, 20)
+            roll = rng.random()
+            if roll < 0.02:
+                record = {"ts": ts, "event": "idle", "last_input": ts - rng.uniform(600, 620)}
+            elif roll < 0.3:
+                record = {"ts": ts, "event": "input", "keys": rng.randint(0, 90), "clicks": rng.randint(0, 10)}
+            else:
+                record = {"ts": ts, "event": rng.choice(["switch", "snapshot", "back_active"]),
+                          "pc": rng.choice(PC_APPS), "phone": rng.choice(PHONE_APPS)}
+            f.write(json.dumps(record) + "\n")
+    return path
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--days", type=int, default=30)
+    parser.add_argument("--events", type=int, default=50000, help="events per day")
+    args = parser.parse_args()
+
+    rng = random.Random(3)
+    with tempfile.TemporaryDirectory() as tmp:
+        folder = Path(tmp)
+        start = datetime(2025, 6, 1)
+        paths = [write_day(folder, start + timedelta(days=i), args.events, rng) for i in range(args.days)]
+        size_mb = sum(p.stat().st_size for p in paths) / 1e6
+        print(f"{args.days} days, {args.days * args.events} events, {size_mb:.1f} MB")
+
+        t = time.perf_counter()
+        serial = merge(summarize_days(paths, workers=1))
+        serial_s = time.perf_counter() - t
+
+        t = time.perf_counter()
+        parallel = merge(summarize_days(paths, workers=os.cpu_count()))
+        parallel_s = time.perf_counter() - t
+
+        assert serial == parallel
+        print(f"serial    {serial_s:7.2f} s")
+        print(f"parallel  {parallel_s:7.2f} s  ({os.cpu_count()} workers, {serial_s / parallel_s:.1f}x)")
+        print("top PC app:", serial["pc"].most_common(1))
+
+
+if __name__ == "__main__":
+    main()
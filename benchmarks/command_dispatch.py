@@ -0,0 +1,50 @@
+# Compiled CommandRegistry vs a linear if/elif chain of substring checks:
+#   python -m benchmarks.command_dispatch --intents 300
+import argparse
+import random
+import string
+import timeit
+
+from utils.commands import CommandRegistry
+
+
+def make_keywords(count, rng):
+    words = set()
+    while len(words) < count:
+        words.add("".join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(4, 9))))
+    return sorted(words)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--intents", type=int, default=300)
+    parser.add_argument("--number", type=int, default=2000)
+    args = parser.parse_args()
+
+    rng = random.Random(11)
+    keywords = make_keywords(args.intents * 2, rng)
+    intents = [keywords[i:i + 2] for i in range(0, len(keywords), 2)]
+
+    registry = CommandRegistry()
+    for index, words in enumerate(intents):
+        registry.register(*words, name=f"intent{index}")(lambda command: None)
+    registry.compile()
+
+    def if_chain(command):
+        command = command.lower()
+        for index, words in enumerate(intents):
+            if any(w in command for w in words):
+                return index
+        return None
+
+    # Utterances hitting the last intent (worst case for the chain) and nothing at all
+    late = f"please {intents[-1][0]} now"
+    miss = "what is the weather like in the city today"
+    for label, utterance in [("last intent", late), ("no match", miss)]:
+        chain = timeit.timeit(lambda: if_chain(utterance), number=args.number) / args.number * 1e6
+        compiled = timeit.timeit(lambda: registry.match(utterance), number=args.number) / args.number * 1e6
+        print(f"{label:<12} if/elif {chain:8.2f} us   registry {compiled:8.2f} us   ({chain / compiled:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
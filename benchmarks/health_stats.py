@@ -0,0 +1,67 @@
+# Overall/windowed health stats on a synthetic 10-year history:
+#   python -m benchmarks.health_stats --years 10
+import argparse
+import random
+import tempfile
+import time
+from datetime import date, timedelta
+
+from core.health_columns import HealthColumns, write_columns
+from core.health_stats import RunningStats, rolling_mean, windowed_stats
+
+
+def synthetic_history(years, seed=7):
+    rng = random.Random(seed)
+    start = date.today() - timedelta(days=365 * years)
+    data = {}
+    for i in range(365 * years):
+        day = (start + timedelta(days=i)).isoformat()
+        if rng.random() < 0.1:
+            # Sleep-only days, like the entries the sync writes for the night before
+            data[day] = {"sleep_duration": "7h 0m", "bedtime": "12:30 AM", "wakeup": "07:30 AM"}
+            continue
+        avg = rng.randint(65, 95)
+        stress = rng.randint(20, 50)
+        data[day] = {
+            "avg_bpm": avg, "min_bpm": avg - rng.randint(10, 25), "max_bpm": avg + rng.randint(20, 50),
+            "avg_stress": stress, "min_stress": max(1, stress - rng.randint(5, 20)), "max_stress": stress + rng.randint(10, 40),
+        }
+    return data
+
+
+def timed(fn, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = fn()
+    return (time.perf_counter() - start) / repeat * 1000, result
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--years", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    data = synthetic_history(args.years)
+    print(f"{len(data)} daily records")
+
+    rescan_ms, _ = timed(lambda: RunningStats.from_records(data).overall(), args.repeat)
+    stats = RunningStats.from_records(data)
+    today = date.today().isoformat()
+    update_ms, _ = timed(lambda: (stats.update(today, {"avg_bpm": 80, "min_bpm": 60, "max_bpm": 110}), stats.overall()), args.repeat * 100)
+    print(f"full rescan per call      {rescan_ms:9.3f} ms")
+    print(f"incremental insert+read   {update_ms:9.4f} ms")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        write_columns(data, tmp)
+        columns = HealthColumns(tmp)
+        windows_ms, report = timed(lambda: windowed_stats(columns), args.repeat)
+        rolling_ms, _ = timed(lambda: rolling_mean(columns.day, columns.floats("avg_stress"), 30), args.repeat)
+        del columns  # release the memory maps before the folder goes
+    print(f"7/30/90d windows + pcts   {windows_ms:9.3f} ms")
+    print(f"30d rolling mean series   {rolling_ms:9.3f} ms")
+    print("90d avg_stress:", report["90d"].get("avg_stress"))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,187 @@
+# Accuracy and speed of the OCR parsers on the checked-in screenshots, kept as a history.
+# Needs a local Tesseract (set TESSERACT_CMD if it is not on PATH):
+#   python -m benchmarks.ocr_regression              # run, compare with the last run, append to history
+#   python -m benchmarks.ocr_regression --no-save    # run without recording
+# Exits non-zero if a case that matched its golden values in the last run no longer does.
+import argparse
+import io
+import json
+import subprocess
+import time
+from contextlib import redirect_stdout
+from datetime import datetime
+from pathlib import Path
+
+from core import roi_ocr, strava_sync
+from core.ocr_pool import tesseract
+from core.readiness import matches_template
+from core.screencap import load_image
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+HISTORY = REPO_ROOT / "benchmarks" / "history" / "ocr_regression.jsonl"
+
+HEART = {"avg_bpm": 80, "min_bpm": 58, "max_bpm": 94}
+STRESS_TODAY = {"avg_stress": 37, "min_stress": 21, "max_stress": 56}
+STRESS_YESTERDAY = {"avg_stress": 33, "min_stress": 8, "max_stress": 62}
+SLEEP = {"bedtime": "01:19 AM", "wake_time": "05:38 AM"}
+
+# Fixture -> (screen, golden values). Filenames don't always match what they show.
+GOLDEN = {
+    "today.png": ("heart", HEART),
+    "yesterday.png": ("heart", HEART),
+    "yesterday_heart.png": ("heart", HEART),
+    "today_stress.png": ("stress", STRESS_TODAY),
+    "yesterday_stress.png": ("stress", STRESS_TODAY),
+    "after.png": ("stress", STRESS_YESTERDAY),
+    "before.png": ("stress", STRESS_YESTERDAY),
+    "sleep.png": ("sleep", SLEEP),
+    "today_heart.png": ("sleep", SLEEP),
+    "check.png": ("home", None),
+}
+
+ROI_PARSERS = {
+    "heart": roi_ocr.extract_heart_roi,
+    "stress": roi_ocr.extract_stress_roi,
+    "sleep": roi_ocr.extract_sleep_roi,
+}
+TEXT_PARSERS = {
+    "heart": strava_sync.extract_heart_data,
+    "stress": strava_sync.extract_stress_data,
+    "sleep": strava_sync.extract_sleep_data,
+}
+
+
+def clear_caches():
+    # Every timing is a cold run through Tesseract
+    roi_ocr.roi_cache.entries.clear()
+    strava_sync.ocr_cache.entries.clear()
+
+
+def timed(fn, repeat):
+    # Best of `repeat` cold runs, in ms, with the last result
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        clear_caches()
+        with redirect_stdout(io.StringIO()):  # the parsers' [DEBUG] prints
+            start = time.perf_counter()
+            result = fn()
+            best = min(best, time.perf_counter() - start)
+    return round(best * 1000, 2), result
+
+
+def parse_time(fn, text, loops=200):
+    # Parsers are microseconds; average many calls, in ms
+    start = time.perf_counter()
+    for _ in range(loops):
+        fn(text)
+    return round((time.perf_counter() - start) / loops * 1000, 4)
+
+
+def case(fixture, path, ocr_ms, parse_ms, values, golden):
+    ok = golden is not None and all(values.get(k) == v for k, v in golden.items())
+    return {"fixture": fixture, "path": path, "ocr_ms": ocr_ms, "parse_ms": parse_ms, "ok": ok, "values": values}
+
+
+def run_fixture(name, screen, golden, repeat):
+    img = load_image(REPO_ROOT / name)
+    results = []
+
+    expected_home = screen == "home"
+    ocr_ms, is_open = timed(lambda: strava_sync.noisefit_is_open(img), repeat)
+    template = matches_template(img, "noisefit_home")
+    results.append(case(name, "noisefit_is_open", ocr_ms, None,
+                        {"open": is_open, "template": template}, {"open": expected_home}))
+    if golden is None:
+        return results
+
+    ocr_ms, values = timed(lambda: ROI_PARSERS[screen](img), repeat)
+    results.append(case(name, "roi", ocr_ms, None, values, golden))
+
+    ocr_ms, text = timed(lambda: tesseract().image_to_string(img), repeat)
+    parser = TEXT_PARSERS[screen]
+    results.append(case(name, "full", ocr_ms, parse_time(parser, text), parser(text), golden))
+
+    if screen == "stress":
+        ocr_ms, info = timed(lambda: strava_sync.extract_stress_info_from_full_image(img), repeat)
+        results.append(case(name, "full_info", ocr_ms, None, strava_sync.stress_from_info(*info), golden))
+    return results
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=REPO_ROOT,
+                              capture_output=True, text=True).stdout.strip() or None
+    except OSError:
+        return None
+
+
+def last_run():
+    if not HISTORY.exists():
+        return None
+    lines = HISTORY.read_text(encoding="utf-8").splitlines()
+    return json.loads(lines[-1]) if lines else None
+
+
+def compare(previous, results, slower=1.25):
+    # Returns (accuracy regressions, latency regressions) against the previous run
+    before = {(r["fixture"], r["path"]): r for r in previous["results"]} if previous else {}
+    broken, slow = [], []
+    for r in results:
+        old = before.get((r["fixture"], r["path"]))
+        if old is None:
+            continue
+        if old["ok"] and not r["ok"]:
+            broken.append(f"{r['fixture']} [{r['path']}]: {old['values']} -> {r['values']}")
+        if r["ocr_ms"] > old["ocr_ms"] * slower + 5:
+            slow.append(f"{r['fixture']} [{r['path']}]: {old['ocr_ms']} -> {r['ocr_ms']} ms")
+    return broken, slow
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--no-save", action="store_true", help="don't append this run to the history")
+    args = parser.parse_args()
+
+    results = []
+    print(f"{'fixture':<22}{'path':<18}{'ocr (ms)':>10}{'parse (ms)':>11}  ok  values")
+    for name, (screen, golden) in GOLDEN.items():
+        if not (REPO_ROOT / name).exists():
+            continue
+        for r in run_fixture(name, screen, golden, args.repeat):
+            results.append(r)
+            parse_ms = "-" if r["parse_ms"] is None else r["parse_ms"]
+            print(f"{r['fixture']:<22}{r['path']:<18}{r['ocr_ms']:>10}{parse_ms:>11}  {'✓' if r['ok'] else '✗'}   {r['values']}")
+
+    summary = {}
+    for r in results:
+        entry = summary.setdefault(r["path"], {"cases": 0, "ok": 0, "ocr_ms": 0.0})
+        entry["cases"] += 1
+        entry["ok"] += r["ok"]
+        entry["ocr_ms"] = round(entry["ocr_ms"] + r["ocr_ms"], 2)
+    for path, entry in summary.items():
+        print(f"{path:<18} {entry['ok']}/{entry['cases']} correct, {entry['ocr_ms']:.0f} ms OCR")
+
+    broken, slow = compare(last_run(), results)
+    for line in slow:
+        print(f"[SLOWER] {line}")
+    for line in broken:
+        print(f"[REGRESSION] {line}")
+
+    if not args.no_save:
+        HISTORY.parent.mkdir(parents=True, exist_ok=True)
+        run = {
+            "ts": datetime.now().isoformat(timespec="seconds"),
+            "commit": git_commit(),
+            "tesseract": str(tesseract().get_tesseract_version()),
+            "summary": summary,
+            "results": results,
+        }
+        with open(HISTORY, "a", encoding="utf-8") as f:
+            f.write(json.dumps(run, ensure_ascii=False) + "\n")
+    raise SystemExit(1 if broken else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+# Full-frame vs region-of-interest OCR timing on the checked-in screenshots.
+# Needs a local Tesseract (set TESSERACT_CMD if it is not on PATH):
+#   python -m benchmarks.ocr_roi --repeat 3
+import argparse
+import time
+from pathlib import Path
+
+from core.ocr_pool import tesseract
+from core.roi_ocr import read_screen, roi_cache
+from core.screencap import load_image
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+# Fixture -> screen layout (some filenames don't match what they show)
+FIXTURES = {
+    "today.png": "heart",
+    "yesterday.png": "heart",
+    "yesterday_heart.png": "heart",
+    "today_stress.png": "stress",
+    "yesterday_stress.png": "stress",
+    "after.png": "stress",
+    "today_heart.png": "sleep",
+    "sleep.png": "sleep",
+}
+
+
+def best_of(fn, repeat):
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        roi_cache.entries.clear()  # time Tesseract on every run, not a cache hit
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    total_full = total_roi = 0.0
+    print(f"{'fixture':<22}{'screen':<8}{'full (s)':>10}{'roi (s)':>10}{'speedup':>9}  roi values")
+    for name, screen in FIXTURES.items():
+        path = REPO_ROOT / name
+        if not path.exists():
+            continue
+        img = load_image(path)
+        full, _ = best_of(lambda: tesseract().image_to_string(img), args.repeat)
+        roi, values = best_of(lambda: read_screen(img, screen), args.repeat)
+        total_full += full
+        total_roi += roi
+        print(f"{name:<22}{screen:<8}{full:>10.3f}{roi:>10.3f}{full / roi:>8.1f}x  {values}")
+
+    print(f"{'total':<30}{total_full:>10.3f}{total_roi:>10.3f}{total_full / total_roi:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
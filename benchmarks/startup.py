@@ -0,0 +1,85 @@
+# Import-time budget per entry point, measured with `python -X importtime`:
+#   python -m benchmarks.startup            # fails if an entry point is over budget
+#   python -m benchmarks.startup --top 5    # also list the heaviest imports
+# Heavy dependencies (pytesseract, pyautogui, pygetwindow, pynput, Vosk, TTS engines)
+# should only load once they are needed, not when the module is imported.
+import argparse
+import os
+import re
+import subprocess
+import sys
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+# Entry point -> budget in ms (imports only, nothing is run)
+BUDGETS = {
+    "main": 60,
+    "core.logger": 150,
+    "core.activity_log": 40,
+    "core.activity_summary": 60,
+    "core.health_store": 250,
+    "core.strava_sync": 350,
+    "core.scheduler": 150,  # asyncio; the jobs import their modules when they start
+}
+
+LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+
+def import_times(module, depth=1):
+    # Returns [(cumulative_us, name)] for the imports at `depth`: 1 = imported by the
+    # interpreter itself, 2 = imported directly by those, ...
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=REPO_ROOT, capture_output=True, text=True, env={**os.environ, "PYTHONDONTWRITEBYTECODE": "1"},
+    )
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1])
+    times = []
+    for line in result.stderr.splitlines():
+        match = LINE.match(line)
+        if match and len(match[3]) == 2 * depth - 1:
+            times.append((int(match[2]), match[4]))
+    return times
+
+
+def measure(module, runs):
+    # Best of `runs`, in ms; the site/encodings imports every interpreter pays are left out
+    baseline = {name for _, name in import_times("sys")}
+    best = None
+    for _ in range(runs):
+        times = [(us, name) for us, name in import_times(module) if name not in baseline]
+        total = sum(us for us, _ in times) / 1000
+        if best is None or total < best[0]:
+            best = (total, times)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("modules", nargs="*", default=list(BUDGETS))
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--top", type=int, default=0)
+    args = parser.parse_args()
+
+    over = 0
+    print(f"{'entry point':<24}{'import (ms)':>12}{'budget':>8}")
+    for module in args.modules:
+        try:
+            total, times = measure(module, args.runs)
+        except RuntimeError as e:
+            print(f"{module:<24}{'error':>12}  {e}")
+            over += 1
+            continue
+        budget = BUDGETS.get(module)
+        flag = "" if budget is None or total <= budget else "  OVER"
+        over += bool(flag)
+        print(f"{module:<24}{total:>12.1f}{budget or '-':>8}{flag}")
+        if args.top:
+            for us, name in sorted(import_times(module, depth=2), reverse=True)[:args.top]:
+                print(f"    {us / 1000:>8.1f}  {name}")
+    sys.exit(1 if over else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+# Speech-end -> reply latency of the voice loop on synthetic WAV fixtures, offline:
+#   python -m benchmarks.voice_loop
+# "sequential" waits for the final result and synthesizes every reply, like the old
+# listen_once() loop; "pipelined" dispatches on a confirmed partial and replays
+# pre-warmed audio. Negative values mean the reply started before the last word
+# ended (the keyword came earlier). A barge-in run checks that speech during a reply
+# interrupts it, and the echo runs feed the replies back into the microphone: with
+# the echo gate off Jarvis interrupts and answers itself, with it on it must not.
+import argparse
+import math
+import struct
+import tempfile
+import wave
+from pathlib import Path
+
+from utils.commands import CommandRegistry
+from utils.tts_cache import CachedSpeaker, StubEngine, TtsCache
+from utils.voice_loop import CHUNK, RATE, EchoSource, ScriptedRecognizer, SilentPlayer, VoiceLoop, WavSource
+
+UTTERANCES = [
+    "hello jarvis",
+    "start the activity log",
+    "take screenshots please",
+    "what is the weather",
+    "hi there",
+]
+REPLIES = {
+    "greeting": "Hello! How can I assist you today?",
+    "activity": "Activity is already being logged in the background.",
+    "screenshot": "Screenshots will be captured during log activity.",
+}
+
+
+def write_utterance(path, words, word_chunks=2):
+    # A 220 Hz tone lasting `word_chunks` chunks per word, so ScriptedRecognizer reveals one word per burst step
+    frames = words * word_chunks * CHUNK
+    with wave.open(str(path), "wb") as w:
+        w.setnchannels(1)
+        w.setsampwidth(2)
+        w.setframerate(RATE)
+        w.writeframes(b"".join(struct.pack("<h", int(6000 * math.sin(2 * math.pi * 220 * i / RATE))) for i in range(frames)))
+
+
+def write_silence(path, seconds):
+    with wave.open(str(path), "wb") as w:
+        w.setnchannels(1)
+        w.setsampwidth(2)
+        w.setframerate(RATE)
+        w.writeframes(bytes(2 * int(seconds * RATE)))
+
+
+def build_registry(loop_ref):
+    commands = CommandRegistry()
+    reply = lambda key: lambda command: loop_ref[0].say(REPLIES[key])
+    commands.register("hello", "hi", name="greeting")(reply("greeting"))
+    commands.register("log", "activity", name="activity")(reply("activity"))
+    commands.register("screenshot", "screenshots", name="screenshot")(reply("screenshot"))
+    return commands
+
+
+def run(wavs, transcripts, cache_dir, early, prewarm, synth_latency, gap=3.5, echo_gain=0.0, echo_threshold=2000,
+        greeting=None):
+    loop_ref = [None]
+    commands = build_registry(loop_ref)
+
+    def dispatch(command):
+        matched = commands.match(command)
+        if matched is None:
+            loop_ref[0].say("Sorry, I didn't understand that.")
+        else:
+            matched[1](command)
+
+    speaker = CachedSpeaker(StubEngine(latency=synth_latency), TtsCache(cache_dir))
+    if prewarm:
+        speaker.prewarm(list(REPLIES.values()) + ["Sorry, I didn't understand that."]).join()
+    player = SilentPlayer()
+    source = WavSource(wavs, gap=gap)
+    if echo_gain:
+        source = EchoSource(source, player, gain=echo_gain)
+    loop = VoiceLoop(source, ScriptedRecognizer(transcripts), dispatch, commands.match, speaker,
+                     player=player, early=early, echo_threshold=echo_threshold)
+    loop_ref[0] = loop
+    if greeting:
+        loop.say(greeting)  # queued before run(), outside any command, like main.py's startup lines
+    loop.run()
+    return loop
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--synth-latency", type=float, default=0.4, help="seconds per stub synthesis")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        wavs = []
+        for index, text in enumerate(UTTERANCES):
+            wavs.append(tmp / f"utterance{index}.wav")
+            write_utterance(wavs[-1], len(text.split()))
+
+        for label, early, prewarm in [("sequential", False, False), ("pipelined", True, True)]:
+            loop = run(wavs, UTTERANCES, tmp / f"cache_{label}", early, prewarm, args.synth_latency)
+            print(f"{label:<12}{loop.latency_report()}")
+
+        # Second utterance starts 0.6 s after the first ends, while the reply is still playing
+        loop = run(wavs[:2], UTTERANCES[:2], tmp / "cache_barge", True, True, args.synth_latency, gap=0.6)
+        print(f"{'barge-in':<12}{loop.latency_report()}")
+
+        # Replies come back at 20% volume: quieter than the user, louder than the speech threshold.
+        # Each utterance should be handled exactly once and no reply should be cut off.
+        for label, echo_threshold in [("echo, open", 0), ("echo, gated", 2000)]:
+            loop = run(wavs, UTTERANCES, tmp / "cache_echo", True, True, args.synth_latency,
+                       echo_gain=0.2, echo_threshold=echo_threshold)
+            heard = [r["text"] for r in loop.records]
+            print(f"{label:<12}{loop.latency_report()} heard={heard}")
+
+        # The startup greeting (queued outside any command) plays over 2 s of silence before
+        # two utterances. Its echo, if heard, is "hello tanishk", which Jarvis would answer:
+        # three commands instead of two.
+        write_silence(tmp / "lead.wav", 2.0)
+        loop = run([tmp / "lead.wav"] + wavs[:2], ["hello tanishk"] + UTTERANCES[:2], tmp / "cache_echo",
+                   True, True, args.synth_latency, echo_gain=0.2, greeting="Hello Tanishk.")
+        print(f"{'greeting':<12}{loop.latency_report()} commands={len(loop.records)} (2 expected)")
+
+
+if __name__ == "__main__":
+    main()
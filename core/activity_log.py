@@ -0,0 +1,79 @@
+import argparse
+import json
+import time
+from datetime import datetime
+
+
+class ActivityLogWriter:
+    """Buffers activity events and appends them as JSONL in batches.
+
+    A batch is written when `max_events` are queued or the oldest queued event
+    is `max_age` seconds old (checked on write and by `maybe_flush`), and on close.
+    """
+
+    def __init__(self, path, max_events=50, max_age=60):
+        self.path = path
+        self.max_events = max_events
+        self.max_age = max_age
+        self.buffer = []
+        self.first_at = None
+        self.flushes = 0
+
+    def write(self, event, **fields):
+        record = {"ts": round(time.time(), 3), "event": event, **fields}
+        if not self.buffer:
+            self.first_at = time.monotonic()
+        self.buffer.append(json.dumps(record, ensure_ascii=False, separators=(",", ":")))
+        self.maybe_flush()
+
+    def maybe_flush(self):
+        if not self.buffer:
+            return
+        if len(self.buffer) >= self.max_events or time.monotonic() - self.first_at >= self.max_age:
+            self.flush()
+
+    def flush(self):
+        if not self.buffer:
+            return
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write("\n".join(self.buffer) + "\n")
+        self.buffer.clear()
+        self.flushes += 1
+
+    def close(self):
+        self.flush()
+
+
+def read_records(path):
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if line and not line.startswith("#"):
+                yield json.loads(line)
+
+
+def render(record):
+    # Same wording as the old free-text log
+    stamp = datetime.fromtimestamp(record["ts"]).strftime("[%I:%M %p]")
+    event = record["event"]
+    pc = record.get("pc", "")
+    phone = record.get("phone", "")
+    if event == "idle":
+        return f"{stamp} Idle for 10+ min"
+    if event == "back_active":
+        return f"{stamp} Back active: PC=\"{pc}\" | Phone=\"{phone}\""
+    if event == "switch":
+        return f"{stamp} Switched PC App: \"{pc}\" | Phone=\"{phone}\""
+    if event == "input":
+        return f"{stamp} Input: {record.get('intensity')} ({record.get('kpm')} keys/min, {record.get('cpm')} clicks/min)"
+    if event == "snapshot":
+        return f"{stamp} Snapshot: \"{pc}\" | Phone=\"{phone}\""
+    return f"{stamp} Active: \"{pc}\" | Phone=\"{phone}\""
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Print a JSONL activity log in the human-readable format.")
+    parser.add_argument("path")
+    args = parser.parse_args()
+    for record in read_records(args.path):
+        print(render(record))
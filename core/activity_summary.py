@@ -0,0 +1,116 @@
+import argparse
+import json
+import re
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+
+from core.input_activity import IDLE_THRESHOLD
+
+MAX_GAP = 900    # longer silences (logger stopped, machine asleep) aren't counted as use
+
+# Old free-text format: [03:15 PM] Switched PC App: "Code" | Phone="com.whatsapp"
+LEGACY_LINE = re.compile(
+    r'^\[(?P<time>\d{1,2}:\d{2} [AP]M)\] (?P<kind>Idle|Back active|Switched PC App|Snapshot|Active)'
+    r'(?::\s*(?:PC=)?"(?P<pc>.*?)" \| Phone="(?P<phone>.*?)")?'
+)
+LEGACY_KINDS = {
+    "Idle": "idle", "Back active": "back_active", "Switched PC App": "switch",
+    "Snapshot": "snapshot", "Active": "active",
+}
+
+
+def iter_events(path):
+    """Yield (ts, event, pc, phone, last_input) one line at a time from a JSONL or legacy .txt log.
+
+    `last_input` is when input stopped, on "idle" events that record it (else None).
+    """
+    path = Path(path)
+    day = re.search(r"\d{4}-\d{2}-\d{2}", path.name)
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            if line.startswith("{"):
+                record = json.loads(line)
+                yield record["ts"], record["event"], record.get("pc"), record.get("phone"), record.get("last_input")
+                continue
+            match = LEGACY_LINE.match(line)
+            if match and day:
+                ts = datetime.strptime(f"{day.group()} {match['time']}", "%Y-%m-%d %I:%M %p").timestamp()
+                yield ts, LEGACY_KINDS[match["kind"]], match["pc"], match["phone"], None
+
+
+def summarize_file(path):
+    # Only the current interval and the per-app totals are held in memory
+    pc_totals = Counter()
+    phone_totals = Counter()
+    current = None  # (start_ts, pc, phone) while active
+    first = last = None
+
+    for ts, event, pc, phone, last_input in iter_events(path):
+        first = ts if first is None else first
+        last = ts
+        if event == "input":
+            continue
+        if current:
+            start, cur_pc, cur_phone = current
+            end = ts
+            if event == "idle":
+                # Older logs don't say when input stopped: the logger's threshold before the event
+                end = last_input if last_input is not None else ts - IDLE_THRESHOLD
+            span = end - start
+            span = min(max(span, 0), MAX_GAP)
+            pc_totals[cur_pc] += span
+            if cur_phone and cur_phone != "None":
+                phone_totals[cur_phone] += span
+        current = None if event == "idle" else (ts, pc, phone)
+
+    return {
+        "file": str(path),
+        "start": first,
+        "end": last,
+        "pc": dict(pc_totals),
+        "phone": dict(phone_totals),
+    }
+
+
+def merge(summaries):
+    pc = Counter()
+    phone = Counter()
+    for summary in summaries:
+        pc.update(summary["pc"])
+        phone.update(summary["phone"])
+    return {"pc": pc, "phone": phone}
+
+
+def summarize_days(paths, workers=None):
+    # One file per task, so days are spread across cores
+    paths = list(paths)
+    if workers == 1 or len(paths) <= 1:
+        return [summarize_file(p) for p in paths]
+    from concurrent.futures import ProcessPoolExecutor
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(summarize_file, paths))
+
+
+def format_minutes(seconds):
+    minutes = int(seconds // 60)
+    return f"{minutes // 60}h {minutes % 60:02d}m"
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Per-app dwell time from activity logs.")
+    parser.add_argument("paths", nargs="+", help="activity_log_<date>.jsonl / .txt files")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--top", type=int, default=10)
+    args = parser.parse_args()
+
+    totals = merge(summarize_days(args.paths, args.workers))
+    print("💻 PC apps")
+    for app, seconds in totals["pc"].most_common(args.top):
+        print(f"  {format_minutes(seconds):>8}  {app}")
+    print("📱 Phone apps")
+    for app, seconds in totals["phone"].most_common(args.top):
+        print(f"  {format_minutes(seconds):>8}  {app}")
@@ -0,0 +1,327 @@
+import os
+import re
+import signal
+import subprocess
+import threading
+import time
+import uuid
+from pathlib import Path
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+REPO_ROOT = Path(__file__).resolve().parent.parent
+REFERENCE_SIZE = (1080, 2340)  # screen the tap/swipe coordinates and OCR boxes were measured on
+
+
+# One lock per phone, held by whichever job is driving it (the health sync) so others back off.
+# Keyed on the real serial (see default_serial), so every job agrees on which lock is whose.
+device_locks = {}
+_locks_guard = threading.Lock()
+
+
+def lock_for(serial):
+    with _locks_guard:
+        return device_locks.setdefault(serial, threading.Lock())
+
+
+def scale_point(x, y, size):
+    # Reference coordinates -> the same spot on a screen of `size`
+    return round(x * size[0] / REFERENCE_SIZE[0]), round(y * size[1] / REFERENCE_SIZE[1])
+
+
+def parse_wm_size(output):
+    # "Physical size: 1080x2340" (an "Override size:" line, if present, wins)
+    sizes = re.findall(r"(Physical|Override) size:\s*(\d+)x(\d+)", output or "")
+    if not sizes:
+        return None
+    kind, w, h = max(sizes, key=lambda m: m[0] == "Override")
+    return int(w), int(h)
+
+
+class AdbError(RuntimeError):
+    pass
+
+
+def _read_exact(stream, size):
+    data = b""
+    while len(data) < size:
+        chunk = stream.read(size - len(data))
+        if not chunk:
+            raise AdbError("ADB stream closed mid-read")
+        data += chunk
+    return data
+
+
+def read_png(stream, marker=None) -> bytes:
+    # Skip anything before the PNG signature, then read chunk by chunk until IEND,
+    # so a screencap can share one stream with other commands without temp files.
+    # Reaching `marker` first means screencap printed nothing (it failed on the device).
+    window = b""
+    tail = b""
+    while window != PNG_SIGNATURE:
+        byte = _read_exact(stream, 1)
+        window = (window + byte)[-len(PNG_SIGNATURE):]
+        if marker:
+            tail = (tail + byte)[-len(marker):]
+            if tail == marker:
+                _read_exact(stream, 1)  # the marker's newline
+                raise AdbError("screencap produced no image")
+
+    parts = [PNG_SIGNATURE]
+    while True:
+        header = _read_exact(stream, 8)
+        length = int.from_bytes(header[:4], "big")
+        parts.append(header)
+        parts.append(_read_exact(stream, length + 4))  # data + crc
+        if header[4:] == b"IEND":
+            return b"".join(parts)
+
+
+class AdbShell:
+    """One long-lived `adb shell` session; commands and screencaps share the same pipe."""
+
+    def __init__(self, serial=None, adb_path="adb", timeout=15.0):
+        self.serial = serial
+        self.adb_path = adb_path
+        self.timeout = timeout  # per call/screencap; the session is killed when it runs over
+        self.timed_out = False
+        self.proc = None
+        self.lock = threading.Lock()
+        self.commands_sent = 0
+
+    def _base(self):
+        cmd = [self.adb_path]
+        if self.serial:
+            cmd += ["-s", self.serial]
+        return cmd
+
+    def start(self):
+        # -T: no pty, so binary screencap output comes through untouched
+        self.proc = subprocess.Popen(
+            self._base() + ["shell", "-T"],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            bufsize=0,
+            start_new_session=os.name == "posix",  # so a timeout can kill it with its children
+        )
+        return self
+
+    def _ensure_alive(self):
+        if self.proc is None or self.proc.poll() is not None:
+            print("[ADB] Shell session not running. (Re)connecting...")
+            self.start()
+
+    def _write(self, line):
+        self._ensure_alive()
+        self.proc.stdin.write((line + "\n").encode("utf-8"))
+        self.proc.stdin.flush()
+        self.commands_sent += 1
+
+    def _expire(self, proc):
+        # Killing the shell makes the blocked read hit EOF
+        self.timed_out = True
+        try:
+            if os.name == "posix":
+                os.killpg(proc.pid, signal.SIGKILL)
+            else:
+                proc.kill()
+        except ProcessLookupError:
+            pass
+
+    def _read(self, cmd, read):
+        # Runs read(stdout) against the deadline, so a hung device raises instead of blocking forever
+        proc = self.proc
+        self.timed_out = False
+        timer = threading.Timer(self.timeout, self._expire, args=(proc,))
+        timer.daemon = True
+        timer.start()
+        try:
+            return read(proc.stdout)
+        except AdbError:
+            if self.timed_out:
+                raise AdbError(f"ADB shell timed out after {self.timeout:g}s: {cmd}") from None
+            raise
+        finally:
+            timer.cancel()
+
+    def _read_until(self, stdout, marker, cmd):
+        lines = []
+        while True:
+            raw = stdout.readline()
+            if not raw:
+                raise AdbError(f"ADB shell closed while running: {cmd}")
+            line = raw.decode("utf-8", errors="replace").rstrip("\r\n")
+            if line == marker:
+                return "\n".join(lines)
+            lines.append(line)
+
+    def send(self, cmd):
+        # Pipelined: returns as soon as the command is queued on the device shell
+        with self.lock:
+            self._write(f"{cmd} >/dev/null 2>&1")
+
+    def call(self, cmd) -> str:
+        marker = f"__jarvis_{uuid.uuid4().hex}__"
+        with self.lock:
+            self._write(f"{cmd} 2>/dev/null; echo {marker}")
+            return self._read(cmd, lambda stdout: self._read_until(stdout, marker, cmd))
+
+    def sync(self):
+        # Blocks until every pipelined command before it has run on the device
+        self.call("true")
+
+    def screencap(self) -> bytes:
+        # The trailing marker keeps the stream in step and tells a failed screencap from a slow one
+        marker = f"__jarvis_{uuid.uuid4().hex}__"
+        with self.lock:
+            self._write(f"screencap -p; echo {marker}")
+
+            def read(stdout):
+                data = read_png(stdout, marker.encode())
+                self._read_until(stdout, marker, "screencap -p")
+                return data
+
+            return self._read("screencap -p", read)
+
+    def close(self):
+        if self.proc is None:
+            return
+        try:
+            self.proc.stdin.write(b"exit\n")
+            self.proc.stdin.flush()
+            self.proc.wait(timeout=3)
+        except Exception:
+            self.proc.kill()
+        self.proc = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class FakeDevice:
+    """Phone stand-in that replays PNG screens and records every command it receives.
+
+    `transitions` is a list of (regex, target) pairs checked against each command;
+    the first match moves the fake to screen `target` ("{screen}" expands to the
+    current screen name). `latency` adds a per-command delay to mimic a real device.
+    """
+
+    def __init__(self, screens, transitions=(), start="home", latency=0.0, serial="fake", size=REFERENCE_SIZE):
+        self.screens = {name: Path(path) for name, path in screens.items()}
+        self.transitions = [(re.compile(p), target) for p, target in transitions]
+        self.screen = start
+        self.latency = latency
+        self.serial = serial
+        self.size = size
+        self.commands = []
+        self.started_at = time.time()
+        self._cache = {}
+
+    def _record(self, cmd):
+        self.commands.append((time.time() - self.started_at, cmd))
+        if self.latency:
+            time.sleep(self.latency)
+        for pattern, target in self.transitions:
+            if pattern.search(cmd):
+                target = target.format(screen=self.screen)
+                if target in self.screens:
+                    self.screen = target
+                break
+
+    @property
+    def commands_sent(self):
+        return len(self.commands)
+
+    def start(self):
+        return self
+
+    def send(self, cmd):
+        self._record(cmd)
+
+    def call(self, cmd) -> str:
+        self._record(cmd)
+        if cmd == "wm size":
+            return f"Physical size: {self.size[0]}x{self.size[1]}"
+        return ""
+
+    def sync(self):
+        pass
+
+    def screencap(self) -> bytes:
+        self._record("screencap -p")
+        path = self.screens[self.screen]
+        if path not in self._cache:
+            self._cache[path] = path.read_bytes()
+        return self._cache[path]
+
+    def close(self):
+        pass
+
+    @classmethod
+    def noisefit(cls, fixtures=REPO_ROOT, latency=0.0, serial="fake", size=REFERENCE_SIZE):
+        # Screens and navigation of the NoiseFit app, built from the checked-in screenshots.
+        # With another `size` the taps it reacts to are scaled, like on a phone of that resolution.
+        fixtures = Path(fixtures)
+
+        def at(x, y):
+            return "{} {}".format(*scale_point(x, y, size))
+
+        screens = {
+            "home": fixtures / "check.png",
+            "heart": fixtures / "today.png",
+            "heart_yesterday": fixtures / "yesterday.png",
+            "stress": fixtures / "today_stress.png",
+            "stress_yesterday": fixtures / "after.png",
+            "sleep": fixtures / "sleep.png",
+        }
+        transitions = [
+            (r"monkey -p", "home"),
+            (rf"input tap {at(800, 1600)}$", "heart"),
+            (rf"input tap {at(305, 940)}$", "stress"),
+            (rf"input tap {at(310, 1600)}$", "sleep"),
+            (rf"input tap {at(80, 170)}$", "home"),
+            (rf"input swipe {at(200, 1000)} {at(900, 1000)}", "{screen}_yesterday"),
+        ]
+        return cls(screens, transitions, latency=latency, serial=serial, size=size)
+
+
+def fake_devices():
+    # JARVIS_FAKE_DEVICES="mom,dad=720x1560@0.05": serial[=WxH][@latency] per simulated phone
+    specs = {}
+    for spec in os.environ.get("JARVIS_FAKE_DEVICES", "fake").split(","):
+        spec, _, latency = spec.strip().partition("@")
+        serial, _, size = spec.partition("=")
+        specs[serial] = {
+            "size": tuple(int(v) for v in size.split("x")) if size else REFERENCE_SIZE,
+            "latency": float(latency or os.environ.get("JARVIS_FAKE_LATENCY", "0")),
+        }
+    return specs
+
+
+def list_devices(adb_path="adb"):
+    # Serials of the phones `adb devices` reports as ready (unauthorized/offline ones are skipped)
+    if os.environ.get("JARVIS_ADB", "").lower() == "fake":
+        return list(fake_devices())
+    output = subprocess.run([adb_path, "devices"], capture_output=True, text=True, timeout=10).stdout
+    return [line.split("\t")[0] for line in output.splitlines()[1:] if line.endswith("\tdevice")]
+
+
+def default_serial(adb_path="adb"):
+    # The phone adb talks to without -s: $ANDROID_SERIAL, else the only one attached (None if none or several)
+    if os.environ.get("ANDROID_SERIAL"):
+        return os.environ["ANDROID_SERIAL"]
+    serials = list_devices(adb_path)
+    return serials[0] if len(serials) == 1 else None
+
+
+def open_device(serial=None):
+    # JARVIS_ADB=fake replays the NoiseFit fixtures instead of talking to a phone
+    if os.environ.get("JARVIS_ADB", "").lower() == "fake":
+        fixtures = os.environ.get("JARVIS_FAKE_SCREENS", REPO_ROOT)
+        specs = fake_devices()
+        spec = specs.get(serial) or next(iter(specs.values()))
+        return FakeDevice.noisefit(fixtures, latency=spec["latency"], serial=serial or "fake", size=spec["size"])
+    return AdbShell(serial).start()
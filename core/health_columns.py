@@ -0,0 +1,307 @@
+import argparse
+import json
+import os
+import shutil
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
+import numpy as np
+
+from core.health_stats import rolling_mean, windowed_stats
+from core.health_store import DEFAULT_DB, HealthStore
+
+DEFAULT_DIR = Path("health_logs") / "columns"
+EPOCH = date(1970, 1, 1)
+VERSION = 2
+MIN_CAPACITY = 64
+NO_DAY = np.iinfo(np.int32).max  # fills the unused tail of the day column
+
+# column -> (dtype, missing marker). bpm and stress fit a byte; sleep is minutes.
+COLUMNS = {
+    "day": (np.int32, None),          # days since 1970-01-01, sorted, one row per date
+    "avg_bpm": (np.uint8, 255),
+    "min_bpm": (np.uint8, 255),
+    "max_bpm": (np.uint8, 255),
+    "avg_stress": (np.uint8, 255),
+    "min_stress": (np.uint8, 255),
+    "max_stress": (np.uint8, 255),
+    "sleep_minutes": (np.int16, -1),  # "6h 58m" -> 418
+    "bedtime": (np.int16, -1),        # minutes after midnight, "03:53 AM" -> 233
+    "wakeup": (np.int16, -1),
+}
+# Store field -> column, for the fields whose names differ
+RENAMED = {"sleep_duration": "sleep_minutes"}
+
+
+def duration_to_minutes(text):
+    hours, _, minutes = text.replace("m", "").partition("h")
+    return int(hours) * 60 + int(minutes)
+
+
+def minutes_to_duration(minutes):
+    return f"{minutes // 60}h {minutes % 60}m"
+
+
+def clock_to_minutes(text):
+    t = datetime.strptime(text.strip(), "%I:%M %p")
+    return t.hour * 60 + t.minute
+
+
+def minutes_to_clock(minutes):
+    return datetime(2000, 1, 1, minutes // 60, minutes % 60).strftime("%I:%M %p")
+
+
+ENCODE = {"sleep_minutes": duration_to_minutes, "bedtime": clock_to_minutes, "wakeup": clock_to_minutes}
+DECODE = {"sleep_minutes": minutes_to_duration, "bedtime": minutes_to_clock, "wakeup": minutes_to_clock}
+
+
+def to_day(date_str):
+    return (date.fromisoformat(date_str) - EPOCH).days
+
+
+def from_day(day):
+    return (EPOCH + timedelta(days=int(day))).isoformat()
+
+
+def encode_records(records):
+    # {date: store fields} -> {column: array}; values that don't parse are reported, not guessed
+    dates = sorted(records)
+    arrays = {"day": np.array([to_day(d) for d in dates], dtype=np.int32)}
+    rejected = []
+    for name, (dtype, missing) in COLUMNS.items():
+        if name == "day":
+            continue
+        field = next((f for f, c in RENAMED.items() if c == name), name)
+        column = np.full(len(dates), missing, dtype=dtype)
+        for i, d in enumerate(dates):
+            value = records[d].get(field)
+            if value in (None, "?"):
+                continue
+            try:
+                encoded = ENCODE[name](value) if name in ENCODE else int(value)
+                limits = np.iinfo(dtype)
+                if encoded == missing or not limits.min <= encoded <= limits.max:
+                    raise ValueError("out of range")
+            except (ValueError, TypeError):
+                rejected.append((d, field, value))
+                continue
+            column[i] = encoded
+        arrays[name] = column
+    return arrays, rejected
+
+
+# Layout: meta.json names the current generation, gen-<n>/ holds one .npy per column.
+# Columns are preallocated to `capacity` rows; only the first `rows` are data.
+#  - write_columns() builds a complete new generation and then swaps meta.json, so a
+#    reader sees either the old set of columns or the new one, never a mix;
+#  - update_columns() changes existing days and appends newer ones in place, then
+#    publishes the new row count. Rows past a reader's count are invisible to it.
+
+def read_meta(folder):
+    path = Path(folder) / "meta.json"
+    if not path.exists():
+        return None
+    with open(path, "r", encoding="utf-8") as f:
+        meta = json.load(f)
+    return meta if meta.get("version") == VERSION else None
+
+
+def _write_meta(folder, meta):
+    tmp = Path(folder) / "meta.tmp.json"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(meta, f, indent=2)
+    os.replace(tmp, Path(folder) / "meta.json")
+
+
+def write_columns(records, folder=DEFAULT_DIR):
+    """Writes every record as a new generation of memory-mappable .npy columns; returns rejected values."""
+    folder = Path(folder)
+    folder.mkdir(parents=True, exist_ok=True)
+    arrays, rejected = encode_records(records)
+    rows = int(arrays["day"].size)
+    capacity = max(MIN_CAPACITY, 2 * rows)  # room to append for a while without a rebuild
+    previous = read_meta(folder)
+    generation = previous["generation"] + 1 if previous else 1
+    target = folder / f"gen-{generation}"
+    shutil.rmtree(target, ignore_errors=True)  # leftover of an interrupted write
+    target.mkdir()
+    for name, (dtype, missing) in COLUMNS.items():
+        column = np.full(capacity, NO_DAY if name == "day" else missing, dtype=dtype)
+        column[:rows] = arrays[name]
+        np.save(target / f"{name}.npy", column)
+    _write_meta(folder, {
+        "version": VERSION, "generation": generation, "rows": rows, "capacity": capacity,
+        "missing": {name: missing for name, (_, missing) in COLUMNS.items() if missing is not None},
+    })
+    for old in folder.glob("gen-*"):
+        if old != target:
+            # Still mapped by a reader on Windows: left for the next rebuild
+            shutil.rmtree(old, ignore_errors=True)
+    return rejected
+
+
+def stored_records(db=DEFAULT_DB):
+    store = HealthStore(db)
+    try:
+        return store.all()
+    finally:
+        store.close()
+
+
+def update_columns(changed, folder=DEFAULT_DIR, all_records=None):
+    """Applies {date: whole row} for the days a sync touched; returns rejected values.
+
+    Known days are rewritten in place and days after the last one appended, so a
+    nightly sync writes a few rows instead of the whole history. Anything else (a
+    backfilled day in the middle, a full column, no columns yet) rebuilds from
+    `all_records()`, e.g. HealthStore.all; by default the health.db next to `folder`.
+    """
+    folder = Path(folder)
+    if all_records is None:
+        all_records = lambda: stored_records(folder.parent / "health.db")
+    meta = read_meta(folder)
+    if meta is None:
+        return write_columns(all_records(), folder)
+    target = folder / f"gen-{meta['generation']}"
+    rows = meta["rows"]
+    arrays, rejected = encode_records(changed)
+    days = np.load(target / "day.npy", mmap_mode="r")[:rows]
+    positions = np.searchsorted(days, arrays["day"])
+    if rows:
+        appended = days[np.minimum(positions, rows - 1)] != arrays["day"]
+    else:
+        appended = np.ones(positions.size, dtype=bool)
+    last = days[-1] if rows else np.iinfo(np.int32).min
+    if np.any(arrays["day"][appended] <= last) or rows + int(appended.sum()) > meta["capacity"]:
+        return write_columns(all_records(), folder)
+    positions[appended] = rows + np.arange(int(appended.sum()))
+    for name in COLUMNS:
+        column = np.load(target / f"{name}.npy", mmap_mode="r+")
+        column[positions] = arrays[name]
+        column.flush()
+        del column
+    meta["rows"] = rows + int(appended.sum())
+    _write_meta(folder, meta)
+    return rejected
+
+
+class HealthColumns:
+    """Read side of the columnar files: arrays are memory-mapped, range queries return views."""
+
+    def __init__(self, folder=DEFAULT_DIR, mmap=True):
+        self.folder = Path(folder)
+        # One read of meta.json pins the generation and row count this reader uses
+        meta = read_meta(self.folder)
+        if meta is None:
+            raise FileNotFoundError(f"no columns (version {VERSION}) in {self.folder}; run `python -m core.health_columns migrate`")
+        target = self.folder / f"gen-{meta['generation']}"
+        self.columns = {
+            name: np.load(target / f"{name}.npy", mmap_mode="r" if mmap else None)[:meta["rows"]]
+            for name in COLUMNS
+        }
+        self.day = self.columns["day"]
+
+    def __len__(self):
+        return int(self.day.size)
+
+    def bounds(self, start=None, end=None):
+        # Row slice for an inclusive ISO date range; days are sorted, so two binary searches
+        lo = 0 if start is None else int(np.searchsorted(self.day, to_day(start), "left"))
+        hi = len(self) if end is None else int(np.searchsorted(self.day, to_day(end), "right"))
+        return slice(lo, hi)
+
+    def column(self, name, start=None, end=None):
+        return self.columns[name][self.bounds(start, end)]
+
+    def values(self, name, start=None, end=None):
+        # Present values only (missing markers dropped)
+        column = self.column(name, start, end)
+        return column[column != COLUMNS[name][1]]
+
+    def floats(self, name, start=None, end=None):
+        # As float64 with NaN for missing days, for rolling_mean
+        column = self.column(name, start, end)
+        return np.where(column == COLUMNS[name][1], np.nan, column.astype(np.float64))
+
+    def mean(self, name, start=None, end=None):
+        values = self.values(name, start, end)
+        return float(values.mean()) if values.size else None
+
+    def last_days(self, days, today=None):
+        end = today or date.today()
+        return (end - timedelta(days=days - 1)).isoformat(), end.isoformat()
+
+    def to_records(self, start=None, end=None):
+        # Back to the store's {date: fields} shape, with sleep as the original strings
+        rows = self.bounds(start, end)
+        records = {}
+        for i, day in enumerate(self.day[rows], start=rows.start):
+            entry = {}
+            for name, (_, missing) in COLUMNS.items():
+                if name == "day":
+                    continue
+                value = int(self.columns[name][i])
+                if value == missing:
+                    continue
+                field = next((f for f, c in RENAMED.items() if c == name), name)
+                entry[field] = DECODE[name](value) if name in DECODE else value
+            records[from_day(day)] = entry
+        return records
+
+
+def migrate(store, folder=DEFAULT_DIR):
+    """Exports every store row and reads it back; returns (rows, rejected, reformatted).
+
+    reformatted lists values that came back in canonical form only ("3:53 AM" -> "03:53 AM").
+    """
+    records = store.all()
+    rejected = write_columns(records, folder)
+    restored = HealthColumns(folder, mmap=False).to_records()
+    skipped = {(d, f) for d, f, _ in rejected}
+    reformatted = []
+    for d, entry in records.items():
+        for field, value in entry.items():
+            if (d, field) in skipped or value == "?":
+                continue
+            back = restored.get(d, {}).get(field)
+            if back != value:
+                reformatted.append((d, field, value, back))
+    return len(records), rejected, reformatted
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Columnar (memory-mapped .npy) copy of the health store.")
+    parser.add_argument("--db", default=DEFAULT_DB)
+    parser.add_argument("--dir", default=DEFAULT_DIR)
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("migrate", help="export the SQLite store and verify the round trip")
+    mean = sub.add_parser("mean", help="mean of a column over the last N days")
+    mean.add_argument("column", choices=[c for c in COLUMNS if c != "day"])
+    mean.add_argument("--days", type=int, default=90)
+    sub.add_parser("windows", help="7/30/90-day means and percentiles of every bpm/stress column")
+    rolling = sub.add_parser("rolling", help="trailing mean of a column, one line per day")
+    rolling.add_argument("column", choices=[c for c in COLUMNS if c != "day"])
+    rolling.add_argument("--window", type=int, default=30)
+    args = parser.parse_args()
+
+    if args.command == "migrate":
+        store = HealthStore(args.db)
+        rows, rejected, reformatted = migrate(store, args.dir)
+        store.close()
+        print(f"✅ Wrote {rows} days to {args.dir}")
+        for d, field, value in rejected:
+            print(f"[WARN] {d} {field}={value!r} could not be encoded; left empty")
+        for d, field, value, back in reformatted:
+            print(f"[INFO] {d} {field}: {value!r} reads back as {back!r}")
+    elif args.command == "mean":
+        columns = HealthColumns(args.dir)
+        start, end = columns.last_days(args.days)
+        value = columns.mean(args.column, start, end)
+        print(f"{args.column} mean {start}..{end}: {'?' if value is None else round(value, 1)}")
+    elif args.command == "windows":
+        print(json.dumps(windowed_stats(HealthColumns(args.dir)), indent=2))
+    else:
+        columns = HealthColumns(args.dir)
+        days, means = rolling_mean(columns.day, columns.floats(args.column), args.window)
+        for day, value in zip(days, means):
+            print(from_day(day), "?" if np.isnan(value) else round(float(value), 1))
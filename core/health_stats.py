@@ -0,0 +1,115 @@
+from datetime import date, timedelta
+
+import numpy as np
+
+METRICS = ["avg_bpm", "min_bpm", "max_bpm", "avg_stress", "min_stress", "max_stress"]
+
+
+class RunningStats:
+    """Count/total/min/max per metric, updated per record so overall stats are O(1).
+
+    Replacing or clearing a value that currently holds the min or max can't be undone
+    incrementally; that metric is marked stale and its min/max rescanned on next read.
+    """
+
+    def __init__(self):
+        self.values = {}  # date -> {metric: value}, needed to subtract replaced values
+        self.count = dict.fromkeys(METRICS, 0)
+        self.total = dict.fromkeys(METRICS, 0)
+        self.low = dict.fromkeys(METRICS)
+        self.high = dict.fromkeys(METRICS)
+        self.stale = set()
+
+    @classmethod
+    def from_records(cls, data):
+        stats = cls()
+        for date_str, entry in data.items():
+            stats.update(date_str, entry)
+        return stats
+
+    def update(self, date_str, entry):
+        # `entry` is the day's whole stored row (None if there is none), so a metric
+        # missing from it is dropped from the totals, not kept from before
+        entry = entry or {}
+        old = self.values.setdefault(date_str, {})
+        for metric in METRICS:
+            value = entry.get(metric) or None
+            prev = old.get(metric)
+            if value == prev:
+                continue
+            if prev is not None:
+                del old[metric]
+                self.count[metric] -= 1
+                self.total[metric] -= prev
+                if prev in (self.low[metric], self.high[metric]):
+                    self.stale.add(metric)
+            if value is not None:
+                old[metric] = value
+                self.count[metric] += 1
+                self.total[metric] += value
+                self.low[metric] = value if self.low[metric] is None else min(self.low[metric], value)
+                self.high[metric] = value if self.high[metric] is None else max(self.high[metric], value)
+        if not old:
+            del self.values[date_str]
+
+    def _refresh(self, metric):
+        vals = np.array([v[metric] for v in self.values.values() if metric in v])
+        self.low[metric] = int(vals.min()) if vals.size else None
+        self.high[metric] = int(vals.max()) if vals.size else None
+        self.stale.discard(metric)
+
+    def overall(self):
+        for metric in list(self.stale):
+            self._refresh(metric)
+
+        def avg(metric):
+            return self.total[metric] // self.count[metric] if self.count[metric] else "?"
+
+        def pick(value):
+            return value if value is not None else "?"
+
+        return {
+            "overall_avg_bpm": avg("avg_bpm"),
+            "overall_min_bpm": pick(self.low["min_bpm"]),
+            "overall_max_bpm": pick(self.high["max_bpm"]),
+            "overall_avg_stress": avg("avg_stress"),
+            "overall_min_stress": pick(self.low["min_stress"]),
+            "overall_max_stress": pick(self.high["max_stress"]),
+        }
+
+
+def rolling_mean(days, values, window):
+    # Trailing mean over `window` calendar days ending at each day, missing days skipped
+    if days.size == 0:
+        return days, values
+    span = np.arange(days.min(), days.max() + 1)
+    dense = np.full(span.size, np.nan)
+    dense[days - span[0]] = values
+    valid = ~np.isnan(dense)
+    sums = np.concatenate([[0.0], np.cumsum(np.where(valid, dense, 0.0))])
+    counts = np.concatenate([[0], np.cumsum(valid)])
+    lo = np.maximum(np.arange(span.size) - window + 1, 0)
+    hi = np.arange(span.size) + 1
+    n = counts[hi] - counts[lo]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        means = (sums[hi] - sums[lo]) / n
+    return span, means
+
+
+def windowed_stats(columns, windows=(7, 30, 90), percentiles=(10, 50, 90), today=None):
+    # `columns` is a core.health_columns.HealthColumns: each window is a slice of the mapped arrays
+    end = today or date.today()
+    report = {}
+    for window in windows:
+        start = (end - timedelta(days=window - 1)).isoformat()
+        entry = {}
+        for metric in METRICS:
+            sample = columns.values(metric, start, end.isoformat())
+            if sample.size == 0:
+                continue
+            entry[metric] = {
+                "mean": round(float(sample.mean()), 1),
+                **{f"p{p}": round(float(v), 1) for p, v in zip(percentiles, np.percentile(sample, percentiles))},
+            }
+        report[f"{window}d"] = entry
+    return report
@@ -0,0 +1,162 @@
+import argparse
+import json
+import re
+import sqlite3
+from pathlib import Path
+
+from core.health_stats import RunningStats
+
+FIELDS = [
+    "avg_bpm", "min_bpm", "max_bpm",
+    "avg_stress", "min_stress", "max_stress",
+    "sleep_duration", "bedtime", "wakeup",
+]
+
+DEFAULT_DB = Path("health_logs") / "health.db"
+
+
+class HealthStore:
+    """Daily health records in SQLite: one row per date, the date primary key doubles as the index.
+
+    Writes are single-row upserts inside a transaction, so an update costs the same
+    however long the history gets, and a crash mid-write leaves the last commit intact.
+    """
+
+    def __init__(self, path=DEFAULT_DB):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(self.path)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        columns = ", ".join(f"{name} {'INTEGER' if name.endswith(('bpm', 'stress')) else 'TEXT'}" for name in FIELDS)
+        self.conn.execute(f"CREATE TABLE IF NOT EXISTS health (date TEXT PRIMARY KEY, {columns})")
+        self.conn.commit()
+        self.listeners = []  # called with (date, row) after each committed write
+        self._stats = None
+
+    def _notify(self, dates):
+        for date_str in dates:
+            row = self.get(date_str)
+            for listener in self.listeners:
+                listener(date_str, row)
+
+    def _upsert(self, date_str, fields, overwrite=True):
+        fields = {k: v for k, v in fields.items() if k in FIELDS}
+        if not fields:
+            return
+        cols = ", ".join(["date"] + list(fields))
+        marks = ", ".join("?" * (len(fields) + 1))
+        if overwrite:
+            updates = ", ".join(f"{k}=excluded.{k}" for k in fields)
+        else:
+            # Only fill columns that are still empty
+            updates = ", ".join(f"{k}=COALESCE(health.{k}, excluded.{k})" for k in fields)
+        self.conn.execute(
+            f"INSERT INTO health ({cols}) VALUES ({marks}) ON CONFLICT(date) DO UPDATE SET {updates}",
+            [date_str] + list(fields.values()),
+        )
+
+    def upsert(self, date_str, fields, overwrite=True):
+        with self.conn:
+            self._upsert(date_str, fields, overwrite)
+        if self.listeners:
+            self._notify([date_str])
+
+    def upsert_many(self, records, overwrite=True):
+        # records: {date: fields}; committed together or not at all
+        with self.conn:
+            for date_str, fields in records.items():
+                self._upsert(date_str, fields, overwrite)
+        if self.listeners:
+            self._notify(records)
+
+    def get(self, date_str):
+        row = self.conn.execute("SELECT * FROM health WHERE date = ?", (date_str,)).fetchone()
+        return _row_to_dict(row) if row else None
+
+    def range(self, start, end):
+        # Inclusive date range, ISO dates sort lexically
+        rows = self.conn.execute(
+            "SELECT * FROM health WHERE date BETWEEN ? AND ? ORDER BY date", (start, end)
+        ).fetchall()
+        return {row["date"]: _row_to_dict(row) for row in rows}
+
+    def has(self, date_str):
+        return self.conn.execute("SELECT 1 FROM health WHERE date = ?", (date_str,)).fetchone() is not None
+
+    def all(self):
+        rows = self.conn.execute("SELECT * FROM health ORDER BY date").fetchall()
+        return {row["date"]: _row_to_dict(row) for row in rows}
+
+    def stats(self):
+        # Built once from the table, then kept current by every write through this store
+        if self._stats is None:
+            self._stats = RunningStats.from_records(self.all())
+            self.listeners.append(self._stats.update)
+        return self._stats
+
+    def close(self):
+        self.conn.close()
+
+
+def _row_to_dict(row):
+    return {k: row[k] for k in FIELDS if row[k] is not None}
+
+
+# --- One-time import of the old JSON file and the per-day text summaries ---
+
+SUMMARY_PATTERNS = {
+    "avg_bpm": r"Average BPM:\s*(\d+)",
+    "min_bpm": r"BPM Range:\s*(\d+)",
+    "max_bpm": r"BPM Range:\s*\d+\s*\D\s*(\d+)",
+    "avg_stress": r"Average Stress:\s*(\d+)",
+    "min_stress": r"Stress Range:\s*(\d+)",
+    "max_stress": r"Stress Range:\s*\d+\s*\D\s*(\d+)",
+    "sleep_duration": r"Sleep Duration:\s*(\d+h \d+m)",
+    "bedtime": r"Bedtime:\s*(\d{1,2}:\d{2}\s*[AP]M)",
+    "wakeup": r"Wake-up Time:\s*(\d{1,2}:\d{2}\s*[AP]M)",
+}
+
+
+def parse_summary(text):
+    record = {}
+    for field, pattern in SUMMARY_PATTERNS.items():
+        match = re.search(pattern, text)
+        if match:
+            value = match.group(1)
+            record[field] = int(value) if value.isdigit() else value
+    return record
+
+
+def import_legacy(store, json_path, summaries_folder):
+    # JSON entries win; text summaries only fill dates/fields the JSON lacks
+    imported = {}
+    json_path = Path(json_path)
+    if json_path.exists():
+        with open(json_path, "r") as f:
+            data = json.load(f)
+        records = {d: {k: v for k, v in entry.items() if v is not None} for d, entry in data.items()}
+        store.upsert_many(records)
+        imported["json"] = len(records)
+
+    summaries = {}
+    for path in sorted(Path(summaries_folder).glob("????-??-??.txt")):
+        record = parse_summary(path.read_text(encoding="utf-8"))
+        if record:
+            summaries[path.stem] = record
+    store.upsert_many(summaries, overwrite=False)
+    imported["summaries"] = len(summaries)
+    return imported
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Import health_data.json and daily summaries into the SQLite store.")
+    parser.add_argument("--db", default=DEFAULT_DB)
+    parser.add_argument("--json", default=Path("health_logs") / "health_data.json")
+    parser.add_argument("--summaries", default="health_logs")
+    args = parser.parse_args()
+
+    store = HealthStore(args.db)
+    counts = import_legacy(store, args.json, args.summaries)
+    print(f"✅ Imported {counts.get('json', 0)} JSON entries and {counts['summaries']} daily summaries into {args.db}")
+    store.close()
@@ -0,0 +1,95 @@
+import time
+
+IDLE_THRESHOLD = 600  # seconds without keyboard/mouse input before "idle"
+
+
+class InputActivityTracker:
+    """Keyboard/mouse activity as plain counters bumped by the pynput hooks.
+
+    The hooks only increment an int or set a flag (no locks, no clock reads);
+    `sample()` turns the counts since the previous sample into rates and decides
+    when input was last seen, so idle time has the resolution of the sample interval.
+    """
+
+    def __init__(self, idle_threshold=IDLE_THRESHOLD):
+        self.idle_threshold = idle_threshold
+        self.keys = 0
+        self.clicks = 0
+        self.moved = False
+        self._seen_keys = 0
+        self._seen_clicks = 0
+        self.last_sample_at = time.time()
+        self.last_active_at = self.last_sample_at
+        self.listeners = []
+
+    # --- hooks (called on pynput's threads) ---
+    def on_press(self, key):
+        self.keys += 1
+
+    def on_click(self, x, y, button, pressed):
+        if pressed:
+            self.clicks += 1
+
+    def on_move(self, x, y):
+        # Fires for every pixel of motion; setting a flag is all it does
+        self.moved = True
+
+    def on_scroll(self, x, y, dx, dy):
+        self.moved = True
+
+    def start(self):
+        from pynput import keyboard, mouse
+
+        self.listeners = [
+            keyboard.Listener(on_press=self.on_press),
+            mouse.Listener(on_click=self.on_click, on_move=self.on_move, on_scroll=self.on_scroll),
+        ]
+        for listener in self.listeners:
+            listener.start()
+        return self
+
+    def stop(self):
+        for listener in self.listeners:
+            listener.stop()
+
+    # --- sampling (called from the logger loop) ---
+    def sample(self):
+        now = time.time()
+        keys, clicks, moved = self.keys, self.clicks, self.moved
+        self.moved = False
+        new_keys = keys - self._seen_keys
+        new_clicks = clicks - self._seen_clicks
+        self._seen_keys, self._seen_clicks = keys, clicks
+
+        if new_keys or new_clicks or moved:
+            self.last_active_at = now
+        minutes = max(now - self.last_sample_at, 1e-6) / 60
+        self.last_sample_at = now
+
+        kpm = new_keys / minutes
+        cpm = new_clicks / minutes
+        return {
+            "keys": new_keys,
+            "clicks": new_clicks,
+            "moved": moved,
+            "kpm": round(kpm, 1),
+            "cpm": round(cpm, 1),
+            "intensity": intensity(kpm, cpm, moved),
+        }
+
+    def idle_seconds(self):
+        return time.time() - self.last_active_at
+
+    def is_idle(self):
+        return self.idle_seconds() > self.idle_threshold
+
+
+def intensity(kpm, cpm, moved):
+    score = kpm + 5 * cpm
+    if score >= 120:
+        return "high"
+    if score >= 30:
+        return "medium"
+    if score > 0 or moved:
+        return "low"
+    return "none"
@@ -1,87 +1,111 @@
+import asyncio
 import time
 import os
-import subprocess
-import psutil
 from datetime import datetime
-from pynput import keyboard, mouse
-import pygetwindow as gw
-import pyautogui
 
-# 📁 Setup paths
-today_str = datetime.now().strftime("%Y-%m-%d")
+from core.activity_log import ActivityLogWriter
+from core.adb_transport import lock_for
+from core.input_activity import IDLE_THRESHOLD, InputActivityTracker
+from core.phone_focus import FocusProbe
+from core.spans import collecting, span, write_report
+
+# 📁 Paths
 log_folder = "E:/Personalized AI/data/raw"
-screenshot_folder = f"E:/Personalized AI/data/screenshots/{today_str}"
-log_file = os.path.join(log_folder, f"activity_log_{today_str}.txt")
+screenshot_root = "E:/Personalized AI/data/screenshots"
+
+# ⏱️ Probe schedule: (interval, timeout) in seconds. Each probe runs as its own
+# task, so a hung phone or slow screenshot can't hold up the others.
+PC_PROBE = (10, 2)
+PHONE_PROBE = (10, 5)
+SAMPLE_INTERVAL = 10
+SCREENSHOT_TIMEOUT = 15
+FLUSH_CHECK_INTERVAL = 5
 
-os.makedirs(log_folder, exist_ok=True)
-os.makedirs(screenshot_folder, exist_ok=True)
+# Persistent adb shell with device-side filtering; results shared for half a probe interval
+phone_focus = FocusProbe(ttl=PHONE_PROBE[0] / 2)
 
-# 📅 Init log file if needed
-if not os.path.exists(log_file):
-    with open(log_file, "w", encoding="utf-8") as f:
-        f.write("# Log started for this session\n")
-    print(f"✅ Log created: {log_file}")
-else:
-    print(f"✅ Log already exists: {log_file}")
+# Latest probe results, read by the sampler
+latest = {"pc_app": "Unknown", "pc_at": 0.0, "phone_app": "None", "phone_at": 0.0}
 
 # 🚁 Interaction tracker
-last_input_time = time.time()
 last_logged_app = ""
 last_logged_state = ""
 last_screenshot_time = 0
 
-def on_press(key):
-    global last_input_time
-    last_input_time = time.time()
-
-def on_click(x, y, button, pressed):
-    if pressed:
-        global last_input_time
-        last_input_time = time.time()
-
-keyboard.Listener(on_press=on_press).start()
-mouse.Listener(on_click=on_click).start()
+# Created by start(), so importing this module has no side effects
+log_writer = None
+input_tracker = None
+screenshots = None
+
+def start():
+    global log_writer, input_tracker, screenshots
+    import pyautogui
+    from core.screenshot_pipeline import ScreenshotPipeline  # pulls in numpy/PIL for dHash
+
+    today_str = datetime.now().strftime("%Y-%m-%d")
+    screenshot_folder = f"{screenshot_root}/{today_str}"
+    log_file = os.path.join(log_folder, f"activity_log_{today_str}.jsonl")
+    os.makedirs(log_folder, exist_ok=True)
+    os.makedirs(screenshot_folder, exist_ok=True)
+
+    # 📅 Events are buffered and appended as JSONL in batches
+    # (`python -m core.activity_log <file>` prints them the old way)
+    log_writer = ActivityLogWriter(log_file, max_events=50, max_age=60)
+    print(f"✅ Logging to: {log_file}")
+
+    input_tracker = InputActivityTracker(idle_threshold=IDLE_THRESHOLD).start()
+
+    # Near-duplicate frames are dropped; kept ones are saved as WebP off the main loop
+    screenshots = ScreenshotPipeline(screenshot_folder, grab=pyautogui.screenshot)
+
+def stop():
+    if input_tracker:
+        input_tracker.stop()
+    if log_writer:
+        log_writer.close()
+    if screenshots:
+        screenshots.close()
+        print(f"📸 Screenshots: {screenshots.stats()}")
+    phone_focus.reset()
+    write_report("logger")
 
 # 🚪 Active window on PC
 def get_active_window():
     try:
+        import pygetwindow as gw
         return gw.getActiveWindow().title
     except:
         return "Unknown"
 
 # 🔍 Classify state
-def classify_state():
-    idle_seconds = time.time() - last_input_time
-    active_app = get_active_window()
-    return ("idle", active_app) if idle_seconds > 600 else ("active", active_app)
+def classify_state(active_app=None):
+    if active_app is None:
+        active_app = get_active_window()
+    return ("idle", active_app) if input_tracker.is_idle() else ("active", active_app)
 
 # 📱 Detect phone activity via ADB
 def get_foreground_app_phone():
     try:
-        result = subprocess.check_output(
-            ["adb", "shell", "dumpsys", "window", "windows"],
-            stderr=subprocess.DEVNULL
-        ).decode("utf-8").lower()
-
-        for line in result.splitlines():
-            if "mCurrentFocus" in line or "mFocusedApp" in line:
-                parts = line.strip().split("/")
-                if len(parts) > 1:
-                    return parts[0].split()[-1]  # package name
-        return None
+        return phone_focus.get()
     except Exception as e:
         print("[ADB Error] Could not get phone app:", e)
         return None
 
-# 📸 Screenshot
+def read_phone_focus():
+    # Skipped while the health sync has the phone; the last value stands
+    lock = lock_for(phone_focus.target())
+    if not lock.acquire(blocking=False):
+        return latest["phone_app"]
+    try:
+        return phone_focus.get()
+    finally:
+        lock.release()
 
+# 📸 Screenshot
+@span()
 def take_screenshot(app):
-    ts = datetime.now().strftime("%H-%M-%S")
-    safe_name = "".join(c for c in app if c.isalnum() or c in (" ", "_", "-")).strip()
-    filename = f"{ts}__{safe_name}.png"
-    filepath = os.path.join(screenshot_folder, filename)
     try:
-        pyautogui.screenshot(filepath)
+        screenshots.capture(app)
     except Exception as e:
         print(f"[Screenshot Error] {e}")
 
@@ -89,30 +113,72 @@ def take_screenshot(app):
 
 def log_event(state, pc_app, phone_app, force_snapshot=False):
     global last_screenshot_time
-    now = datetime.now()
-    now_str = now.strftime("[%I:%M %p]")
 
-    with open(log_file, "a", encoding="utf-8") as f:
-        if state == "idle":
-            f.write(f"{now_str} Idle for 10+ min\n")
+    if state == "idle":
+        # When input stopped, so the summary doesn't have to assume IDLE_THRESHOLD
+        log_writer.write("idle", last_input=round(input_tracker.last_active_at, 3))
+    else:
+        if last_logged_state == "idle":
+            event = "back_active"
+        elif pc_app != last_logged_app:
+            event = "switch"
+        elif force_snapshot:
+            event = "snapshot"
         else:
-            if last_logged_state == "idle":
-                f.write(f"{now_str} Back active: PC=\"{pc_app}\" | Phone=\"{phone_app}\"\n")
-            elif pc_app != last_logged_app:
-                f.write(f"{now_str} Switched PC App: \"{pc_app}\" | Phone=\"{phone_app}\"\n")
-            elif force_snapshot:
-                f.write(f"{now_str} Snapshot: \"{pc_app}\" | Phone=\"{phone_app}\"\n")
-            else:
-                f.write(f"{now_str} Active: \"{pc_app}\" | Phone=\"{phone_app}\"\n")
+            event = "active"
+        log_writer.write(event, pc=pc_app, phone=phone_app)
 
     if force_snapshot or pc_app != last_logged_app:
-        take_screenshot(pc_app)
+        schedule_screenshot(pc_app)
         last_screenshot_time = time.time()
 
-# 🔄 Main loop
-while True:
-    state, pc_app = classify_state()
-    phone_app = get_foreground_app_phone() or "None"
+def schedule_screenshot(app):
+    # Runs in a worker thread so the sampler keeps its schedule while the PNG is written
+    async def capture():
+        try:
+            await asyncio.wait_for(asyncio.to_thread(take_screenshot, app), SCREENSHOT_TIMEOUT)
+        except asyncio.TimeoutError:
+            print("[Screenshot Error] Timed out")
+    asyncio.get_running_loop().create_task(capture())
+
+# 🔄 Probes and sampler
+async def every(interval, fn):
+    # Fixed-rate ticks: a slow run doesn't push later ticks back
+    next_tick = time.monotonic()
+    while True:
+        await fn()
+        next_tick += interval
+        await asyncio.sleep(max(0, next_tick - time.monotonic()))
+
+@span()
+async def probe_pc():
+    try:
+        latest["pc_app"] = await asyncio.wait_for(asyncio.to_thread(get_active_window), PC_PROBE[1])
+        latest["pc_at"] = time.time()
+    except asyncio.TimeoutError:
+        print("[PC Probe] Timed out")
+
+@span()
+async def probe_phone():
+    try:
+        latest["phone_app"] = await asyncio.wait_for(asyncio.to_thread(read_phone_focus), PHONE_PROBE[1]) or "None"
+        latest["phone_at"] = time.time()
+    except asyncio.TimeoutError:
+        print("[ADB Error] Phone probe timed out")
+        # Closing the hung shell can block for seconds; keep it off the event loop
+        await asyncio.to_thread(phone_focus.reset)
+    except Exception as e:
+        print("[ADB Error] Could not get phone app:", e)
+
+@span()
+async def sample():
+    global last_logged_state, last_logged_app
+    activity = input_tracker.sample()
+    if activity["intensity"] != "none":
+        # Per-interval input intensity, not just the idle/active flip
+        log_writer.write("input", **activity)
+    state, pc_app = classify_state(latest["pc_app"])
+    phone_app = latest["phone_app"]
     now = time.time()
 
     should_snapshot = (state == "active") and ((now - last_screenshot_time) >= 60)
@@ -126,4 +192,27 @@ while True:
         last_logged_state = state
         last_logged_app = pc_app
 
-    time.sleep(10)
+@span()
+async def flush_log():
+    log_writer.maybe_flush()
+
+async def main():
+    # The probes' timings stay apart from a health sync running in the same process
+    with collecting("logger"):
+        start()
+        try:
+            await probe_pc()  # first sample shouldn't see the placeholder app
+            await asyncio.gather(
+                every(PC_PROBE[0], probe_pc),
+                every(PHONE_PROBE[0], probe_phone),
+                every(SAMPLE_INTERVAL, sample),
+                every(FLUSH_CHECK_INTERVAL, flush_log),
+            )
+        finally:
+            stop()
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        pass
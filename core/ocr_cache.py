@@ -0,0 +1,88 @@
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+from core.readiness import dhash, hamming
+
+
+def content_hash(data: bytes) -> int:
+    # Exact key for data that is already normalised (e.g. a binarized OCR tile)
+    return int.from_bytes(hashlib.blake2b(data, digest_size=8).digest(), "big")
+
+
+class OcrCache:
+    """LRU map from frame hash to OCR result; near-identical frames share an entry.
+
+    Lookups try the exact hash first, then any entry within `max_distance` bits
+    (skipped with near=False, for content hashes where nearby bits mean nothing).
+    Keys are namespaced so the same frame can hold e.g. full text and ROI values.
+    Safe to share between threads (one sync per phone); OCR itself runs outside the lock.
+    """
+
+    def __init__(self, max_entries=256, max_distance=4, path=None):
+        self.max_entries = max_entries
+        self.max_distance = max_distance
+        self.path = Path(path) if path else None
+        self.entries = OrderedDict()  # (namespace, hash) -> value
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.RLock()
+        if self.path and self.path.exists():
+            self.load()
+
+    def get(self, namespace, key, near=True):
+        with self.lock:
+            return self._get(namespace, key, near)
+
+    def _get(self, namespace, key, near):
+        exact = (namespace, key)
+        if exact in self.entries:
+            self.entries.move_to_end(exact)
+            self.hits += 1
+            return self.entries[exact]
+        if near and self.max_distance:
+            for (ns, other), value in self.entries.items():
+                if ns == namespace and hamming(key, other) <= self.max_distance:
+                    self.entries.move_to_end((ns, other))
+                    self.hits += 1
+                    return value
+        self.misses += 1
+        return None
+
+    def put(self, namespace, key, value):
+        with self.lock:
+            self.entries[(namespace, key)] = value
+            self.entries.move_to_end((namespace, key))
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+    def cached(self, namespace, image, compute):
+        key = dhash(image)
+        value = self.get(namespace, key)
+        if value is None:
+            value = compute(image)
+            self.put(namespace, key, value)
+        return value
+
+    def stats(self):
+        total = self.hits + self.misses
+        rate = f"{100 * self.hits / total:.0f}%" if total else "n/a"
+        return f"{self.hits} hits / {self.misses} misses ({rate}), {len(self.entries)} entries"
+
+    def load(self):
+        with open(self.path, "r", encoding="utf-8") as f:
+            for namespace, key, value in json.load(f):
+                self.put(namespace, int(key, 16), value)
+
+    def save(self):
+        if not self.path:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self.lock:
+            rows = [[ns, f"{key:x}", value] for (ns, key), value in self.entries.items()]
+            tmp = self.path.with_suffix(".tmp")
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(rows, f)
+            tmp.replace(self.path)
@@ -0,0 +1,91 @@
+import os
+from concurrent.futures import Future, ProcessPoolExecutor
+
+from core import spans
+
+# Windows install location unless TESSERACT_CMD says otherwise; elsewhere tesseract is on PATH
+WINDOWS_TESSERACT = r"C:\Program Files\Tesseract-OCR\tesseract.exe"
+TESSERACT_CMD = os.environ.get("TESSERACT_CMD") or (WINDOWS_TESSERACT if os.path.exists(WINDOWS_TESSERACT) else None)
+
+
+def tesseract():
+    # pytesseract costs ~0.2s to import, so it's loaded on the first OCR call, not at startup
+    import pytesseract
+
+    if TESSERACT_CMD:
+        pytesseract.pytesseract.tesseract_cmd = TESSERACT_CMD
+    return pytesseract
+
+
+class InlineExecutor:
+    """Runs jobs immediately on submit; same interface as the pool, for serial runs and A/B timing."""
+
+    def submit(self, fn, *args, **kwargs):
+        future = Future()
+        try:
+            future.set_result(fn(*args, **kwargs))
+        except Exception as e:
+            future.set_exception(e)
+        return future
+
+    def shutdown(self, wait=True):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.shutdown()
+
+
+class TracedPool:
+    """Process pool whose jobs bring their spans back, so worker-side OCR shows up in the timing report."""
+
+    def __init__(self, pool):
+        self.pool = pool
+
+    def submit(self, fn, *args, **kwargs):
+        outer = Future()
+        collector = spans.current()  # done() runs on the pool's thread, so remember whose job it is
+
+        def done(inner):
+            try:
+                result, taken = inner.result()
+            except Exception as e:
+                outer.set_exception(e)
+                return
+            spans.merge(taken, collector)
+            outer.set_result(result)
+
+        self.pool.submit(spans.run_traced, fn, *args, **kwargs).add_done_callback(done)
+        return outer
+
+    def shutdown(self, wait=True):
+        self.pool.shutdown(wait)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.shutdown()
+
+
+def _init_worker(tesseract_cmd):
+    # Workers may be spawned fresh (Windows), so carry over the configured Tesseract path
+    global TESSERACT_CMD
+    TESSERACT_CMD = tesseract_cmd
+    tesseract()
+
+
+def make_ocr_pool(workers=None):
+    # JARVIS_OCR_WORKERS=0 keeps OCR on the navigation thread
+    if workers is None:
+        workers = int(os.environ.get("JARVIS_OCR_WORKERS", min(5, os.cpu_count() or 1)))
+    if workers <= 0:
+        return InlineExecutor()
+    pool = ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_worker,
+        initargs=(TESSERACT_CMD,),
+    )
+    return TracedPool(pool) if spans.ENABLED else pool
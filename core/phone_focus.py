@@ -0,0 +1,67 @@
+import threading
+import time
+
+from core.adb_transport import AdbShell, default_serial
+
+# grep runs on the phone, so only the one or two focus lines cross the wire
+FOCUS_QUERY = "dumpsys window | grep -E -m 2 'mCurrentFocus|mFocusedApp'"
+
+
+def parse_focus(output):
+    for line in output.splitlines():
+        if "mCurrentFocus" in line or "mFocusedApp" in line:
+            parts = line.strip().split("/")
+            if len(parts) > 1:
+                return parts[0].split()[-1]  # package name
+    return None
+
+
+def focused_package(device):
+    try:
+        return parse_focus(device.call(FOCUS_QUERY))
+    except Exception:
+        return None
+
+
+class FocusProbe:
+    """Foreground package of the phone over a persistent shell, cached for `ttl` seconds.
+
+    Every consumer within the same tick shares one query.
+    """
+
+    def __init__(self, device=None, ttl=5.0, serial=None):
+        self.device = device
+        self.configured = serial
+        self.serial = serial  # None: whichever phone adb picks, looked up on first use
+        self.ttl = ttl
+        self.value = None
+        self.fetched_at = 0.0
+        self.queries = 0
+        self.lock = threading.Lock()
+
+    def target(self):
+        # Serial of the probed phone, so callers can take the same lock as the health sync
+        if self.serial is None:
+            self.serial = default_serial()
+        return self.serial
+
+    def get(self):
+        with self.lock:
+            if time.monotonic() - self.fetched_at < self.ttl:
+                return self.value
+            if self.device is None:
+                self.device = AdbShell(self.target()).start()
+            self.value = parse_focus(self.device.call(FOCUS_QUERY))
+            self.fetched_at = time.monotonic()
+            self.queries += 1
+            return self.value
+
+    def reset(self):
+        # Drop a hung session; the next get() reconnects
+        if self.device is not None:
+            self.device.close()
+        if self.configured is None and isinstance(self.device, AdbShell):
+            # Look the phone up again next time; it may have been swapped
+            self.device = None
+            self.serial = None
+        self.fetched_at = 0.0
@@ -0,0 +1,92 @@
+import time
+from pathlib import Path
+
+import numpy as np
+from PIL import Image
+
+from core.adb_transport import REFERENCE_SIZE
+from core.phone_focus import focused_package
+from core.screencap import capture_image, load_image
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+# Small reference regions cut from the checked-in screenshots: (fixture, box)
+TEMPLATES = {
+    "noisefit_home": ("check.png", (35, 180, 505, 275)),      # "NoiseFit Assist" header
+    "yesterday_label": ("after.png", (47, 615, 470, 680)),    # "Yesterday" under the average
+}
+
+_template_hashes = {}
+
+
+def dhash(img, size=16) -> int:
+    # Difference hash: compare neighbouring pixels of a tiny grayscale thumbnail
+    small = img.convert("L").resize((size + 1, size), Image.BILINEAR)
+    px = np.asarray(small, dtype=np.int16)
+    bits = px[:, 1:] > px[:, :-1]
+    return int.from_bytes(np.packbits(bits).tobytes(), "big")
+
+
+def hamming(a: int, b: int) -> int:
+    return (a ^ b).bit_count()
+
+
+def scale_box(box, size):
+    sx = size[0] / REFERENCE_SIZE[0]
+    sy = size[1] / REFERENCE_SIZE[1]
+    x1, y1, x2, y2 = box
+    return (round(x1 * sx), round(y1 * sy), round(x2 * sx), round(y2 * sy))
+
+
+def region_hash(img, box) -> int:
+    return dhash(img.crop(scale_box(box, img.size)), size=8)
+
+
+def template_hash(name):
+    if name not in _template_hashes:
+        fixture, box = TEMPLATES[name]
+        path = REPO_ROOT / fixture
+        _template_hashes[name] = region_hash(load_image(path), box) if path.exists() else None
+    return _template_hashes[name]
+
+
+def matches_template(img, name, max_distance=8):
+    # None when no reference image is available, so callers can fall back to OCR
+    ref = template_hash(name)
+    if ref is None:
+        return None
+    return hamming(region_hash(img, TEMPLATES[name][1]), ref) <= max_distance
+
+
+def wait_for_stable(device, timeout=10, interval=0.15, max_distance=6, stable_frames=2):
+    # Returns the first frame once consecutive captures stop changing (or the last one on timeout)
+    deadline = time.time() + timeout
+    img = capture_image(device)
+    prev = dhash(img)
+    steady = 0
+    while time.time() < deadline:
+        time.sleep(interval)
+        img = capture_image(device)
+        cur = dhash(img)
+        steady = steady + 1 if hamming(prev, cur) <= max_distance else 0
+        if steady >= stable_frames - 1:
+            return img
+        prev = cur
+    print("[!] Screen did not settle before timeout.")
+    return img
+
+
+def wait_for_screen(device, template, timeout=30, interval=0.3, package=None):
+    # Cheap checks first (window focus, settled frame, region match); returns the frame or None
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if package:
+            focus = focused_package(device)
+            if focus is not None and focus != package:
+                time.sleep(interval)
+                continue
+        img = wait_for_stable(device, timeout=max(deadline - time.time(), 0))
+        if matches_template(img, template) is not False:
+            return img
+        time.sleep(interval)
+    return None
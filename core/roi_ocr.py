@@ -0,0 +1,119 @@
+import re
+from typing import NamedTuple
+
+import numpy as np
+from PIL import Image, ImageOps
+
+from core.ocr_cache import OcrCache, content_hash
+from core.ocr_pool import tesseract
+from core.readiness import scale_box
+from core.spans import span
+
+DIGITS = "0123456789"
+
+
+class Roi(NamedTuple):
+    box: tuple            # (x1, y1, x2, y2) on a 1080x2340 screen
+    keep: str = "dark"    # "dark": black text on light bg, "light": white text on coloured bg
+    cutoff: int = 110     # grayscale threshold separating text from background/labels
+    scale: float = 1.0    # downscale factor before OCR; big digits read fine at half size
+    chars: str = DIGITS   # tesseract whitelist, None for free text
+
+
+# Per-screen layout of the numbers we actually need. The dark cutoff drops the
+# grey "bpm"/"Normal"/"Bedtime" captions, so only the values reach Tesseract.
+LAYOUTS = {
+    "heart": {
+        "avg": Roi((40, 490, 500, 610), scale=0.5),
+        "range": Roi((90, 1750, 480, 1860), keep="light", cutoff=200, scale=0.6, chars=DIGITS + "-"),
+    },
+    "stress": {
+        "avg": Roi((40, 490, 480, 610), scale=0.5),
+        "range": Roi((480, 490, 1060, 610), scale=0.5, chars=DIGITS + "-"),
+    },
+    "sleep": {
+        "bedtime": Roi((760, 1840, 1070, 1920), chars=DIGITS + ":APM "),
+        "wakeup": Roi((760, 1925, 1070, 2010), chars=DIGITS + ":APM "),
+    },
+    "day": {
+        "label": Roi((40, 605, 480, 690), cutoff=200, chars=None),
+    },
+}
+
+
+def preprocess(img, roi: Roi) -> Image.Image:
+    tile = img.crop(scale_box(roi.box, img.size)).convert("L")
+    if roi.scale != 1.0:
+        tile = tile.resize((max(1, round(tile.width * roi.scale)), max(1, round(tile.height * roi.scale))), Image.BILINEAR)
+    px = np.asarray(tile)
+    text = px > roi.cutoff if roi.keep == "light" else px < roi.cutoff
+    # Tesseract wants dark text on white with a little margin
+    binary = Image.fromarray(np.where(text, 0, 255).astype(np.uint8))
+    return ImageOps.expand(binary, border=10, fill=255)
+
+
+def tesseract_config(roi: Roi) -> str:
+    config = "--psm 7"
+    if roi.chars:
+        config += f" -c tessedit_char_whitelist={roi.chars.replace(' ', '')}"
+    return config
+
+
+# Binarized tiles are stable across captures, so an exact hash of the tile is a safe key
+roi_cache = OcrCache(max_entries=512, max_distance=0)
+
+
+def read_roi(img, roi: Roi) -> str:
+    tile = preprocess(img, roi)
+    config = tesseract_config(roi)
+    key = content_hash(tile.tobytes() + config.encode())
+    text = roi_cache.get("roi", key)
+    if text is None:
+        with span("tesseract_roi"):
+            text = tesseract().image_to_string(tile, config=config).strip()
+        roi_cache.put("roi", key, text)
+    return text
+
+
+def read_screen(img, screen: str) -> dict:
+    return {name: read_roi(img, roi) for name, roi in LAYOUTS[screen].items()}
+
+
+def _first_int(text):
+    match = re.search(r"\d{1,3}", text)
+    return int(match.group()) if match else None
+
+
+def _range(text):
+    match = re.search(r"(\d{1,3})\s*-\s*(\d{1,3})", text)
+    return (int(match.group(1)), int(match.group(2))) if match else (None, None)
+
+
+def _clock(text):
+    match = re.search(r"(\d{1,2}):?(\d{2})\s*([AP])", text)
+    return f"{int(match.group(1)):02d}:{match.group(2)} {match.group(3)}M" if match else "?"
+
+
+@span()
+def extract_heart_roi(img) -> dict:
+    texts = read_screen(img, "heart")
+    low, high = _range(texts["range"])
+    return {"avg_bpm": _first_int(texts["avg"]), "min_bpm": low, "max_bpm": high}
+
+
+@span()
+def extract_stress_roi(img) -> dict:
+    texts = read_screen(img, "stress")
+    low, high = _range(texts["range"])
+    return {"avg_stress": _first_int(texts["avg"]), "min_stress": low, "max_stress": high}
+
+
+@span()
+def extract_sleep_roi(img) -> dict:
+    texts = read_screen(img, "sleep")
+    return {"bedtime": _clock(texts["bedtime"]), "wake_time": _clock(texts["wakeup"])}
+
+
+@span()
+def read_day_label(img) -> str:
+    return read_roi(img, LAYOUTS["day"]["label"])
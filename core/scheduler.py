@@ -0,0 +1,284 @@
+import argparse
+import asyncio
+import json
+import threading
+import time
+from datetime import datetime, timedelta
+
+
+# --- Cron-style timing: "minute hour day-of-month month day-of-week" ---
+
+def _field(spec, low, high, name):
+    # "*", "5", "1-5", "*/15", "5/20" (= 5-high/20) and comma lists of those; out of range is an error
+    values = set()
+    for part in spec.split(","):
+        body, slash, step = part.partition("/")
+        try:
+            if body == "*":
+                start, end = low, high
+            elif "-" in body:
+                start, end = map(int, body.split("-"))
+            else:
+                start = int(body)
+                end = high if slash else start
+            step = int(step) if slash else 1
+        except ValueError:
+            raise ValueError(f"bad cron {name} field {spec!r}") from None
+        if not low <= start <= end <= high or step < 1:
+            raise ValueError(f"cron {name} field {spec!r} outside {low}-{high}")
+        values.update(range(start, end + 1, step))
+    return values
+
+
+class Cron:
+    """Five-field cron expression, e.g. "30 0 * * *" = 00:30 every day.
+
+    Follows cron: day of week 0 or 7 = Sunday, and when both day of month and day
+    of week are restricted, a day matching either one fires.
+    """
+
+    def __init__(self, expr):
+        fields = expr.split()
+        if len(fields) != 5:
+            raise ValueError(f"expected 5 cron fields, got {expr!r}")
+        self.expr = expr
+        self.minutes = _field(fields[0], 0, 59, "minute")
+        self.hours = _field(fields[1], 0, 23, "hour")
+        self.days = _field(fields[2], 1, 31, "day of month")
+        self.months = _field(fields[3], 1, 12, "month")
+        self.weekdays = {d % 7 for d in _field(fields[4], 0, 7, "day of week")}
+        self.any_day = fields[2].startswith("*")
+        self.any_weekday = fields[4].startswith("*")
+
+    def day_matches(self, t):
+        in_month = t.day in self.days
+        in_week = (t.weekday() + 1) % 7 in self.weekdays  # Python: Monday = 0; cron: Sunday = 0
+        if self.any_day or self.any_weekday:
+            return in_month and in_week
+        return in_month or in_week
+
+    def matches(self, t):
+        return (t.minute in self.minutes and t.hour in self.hours
+                and t.month in self.months and self.day_matches(t))
+
+    def next_after(self, t):
+        t = t.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        for _ in range(366 * 24 * 60):
+            if t.month not in self.months or not self.day_matches(t):
+                t = t.replace(hour=0, minute=0) + timedelta(days=1)
+            elif t.hour not in self.hours:
+                t = t.replace(minute=0) + timedelta(hours=1)
+            elif t.minute not in self.minutes:
+                t += timedelta(minutes=1)
+            else:
+                return t
+        raise ValueError(f"cron {self.expr!r} never fires")
+
+
+# --- Supervised jobs ---
+
+class Job:
+    """A worker run by the scheduler.
+
+    Without `cron` the job is a service: `target(stop)` should run until `stop` is
+    set, and it is restarted with exponential backoff if it raises or returns early.
+    With `cron` it runs once per firing and is retried up to `retries` times.
+    """
+
+    def __init__(self, name, target, cron=None, retries=3, backoff=5.0, max_backoff=600.0, healthy_after=60.0):
+        self.name = name
+        self.target = target
+        self.cron = Cron(cron) if isinstance(cron, str) else cron
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.healthy_after = healthy_after  # a run this long resets the backoff
+        self.runs = 0
+        self.failures = 0
+        self.running_since = None
+        self.last_runtime = None
+        self.total_runtime = 0.0
+        self.last_error = None
+        self.next_run = None
+
+    def run_once(self, stop):
+        self.runs += 1
+        self.running_since = time.time()
+        started = time.monotonic()
+        try:
+            self.target(stop)
+            return True
+        except Exception as e:
+            self.failures += 1
+            self.last_error = f"{type(e).__name__}: {e}"
+            print(f"[Scheduler] {self.name} failed: {self.last_error}")
+            return False
+        finally:
+            self.last_runtime = time.monotonic() - started
+            self.total_runtime += self.last_runtime
+            self.running_since = None
+
+    def supervise(self, stop):
+        try:
+            if self.cron:
+                self._run_on_schedule(stop)
+            else:
+                self._run_service(stop)
+        except Exception as e:
+            # The supervisor itself failed (e.g. a cron that never fires): show it in the metrics
+            self.failures += 1
+            self.last_error = f"supervisor: {type(e).__name__}: {e}"
+            print(f"[Scheduler] {self.name} stopped: {self.last_error}")
+
+    def _run_service(self, stop):
+        delay = self.backoff
+        while not stop.is_set():
+            self.run_once(stop)
+            if stop.is_set():
+                break
+            if self.last_runtime >= self.healthy_after:
+                delay = self.backoff
+            print(f"[Scheduler] {self.name} exited; restarting in {delay:g}s")
+            stop.wait(delay)
+            delay = min(delay * 2, self.max_backoff)
+
+    def _run_on_schedule(self, stop):
+        while not stop.is_set():
+            self.next_run = self.cron.next_after(datetime.now())
+            if stop.wait((self.next_run - datetime.now()).total_seconds()):
+                break
+            delay = self.backoff
+            for attempt in range(self.retries + 1):
+                if self.run_once(stop) or stop.is_set():
+                    break
+                if attempt < self.retries:
+                    print(f"[Scheduler] {self.name}: retry {attempt + 1}/{self.retries} in {delay:g}s")
+                    stop.wait(delay)
+                    delay = min(delay * 2, self.max_backoff)
+
+    def metrics(self):
+        return {
+            "runs": self.runs,
+            "failures": self.failures,
+            "running_for": round(time.time() - self.running_since, 1) if self.running_since else None,
+            "last_runtime": round(self.last_runtime, 1) if self.last_runtime is not None else None,
+            "total_runtime": round(self.total_runtime, 1),
+            "last_error": self.last_error,
+            "next_run": self.next_run.isoformat(timespec="minutes") if self.next_run else None,
+        }
+
+
+class Scheduler:
+    def __init__(self, jobs):
+        self.jobs = list(jobs)
+        self.stop_event = threading.Event()
+        self.threads = []
+
+    def start(self):
+        for job in self.jobs:
+            thread = threading.Thread(target=job.supervise, args=(self.stop_event,), name=job.name, daemon=True)
+            thread.start()
+            self.threads.append(thread)
+        return self
+
+    def stop(self, timeout=15):
+        self.stop_event.set()
+        for thread in self.threads:
+            thread.join(timeout)
+
+    def metrics(self):
+        return {job.name: job.metrics() for job in self.jobs}
+
+    def run_forever(self, report_every=600, metrics_path=None):
+        self.start()
+        try:
+            while not self.stop_event.wait(report_every):
+                self.report(metrics_path)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.stop()
+            self.report(metrics_path)
+
+    def report(self, metrics_path=None):
+        metrics = self.metrics()
+        print(f"[Scheduler] {json.dumps(metrics)}")
+        if metrics_path:
+            with open(metrics_path, "w", encoding="utf-8") as f:
+                json.dump(metrics, f, indent=2)
+
+
+# --- The three Jarvis workers ---
+
+def run_logger(stop):
+    from core import logger
+
+    async def runner():
+        task = asyncio.create_task(logger.main())
+        while not stop.is_set() and not task.done():
+            await asyncio.sleep(0.5)
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+
+    asyncio.run(runner())
+
+
+def run_sync(stop):
+    # Each attached phone gets its own sync, concurrently. A sync holds that phone's lock,
+    # so the logger's phone probe pauses meanwhile.
+    from core import strava_sync
+
+    results = strava_sync.sync_all()
+    if not results:
+        raise RuntimeError("no phone attached")
+    failed = [serial for serial, result in results.items() if not result["ok"]]
+    if failed:
+        raise RuntimeError(f"sync failed on {', '.join(failed)}")
+
+
+def run_voice(stop):
+    import main
+
+    main.get_speaker().prewarm(main.STATIC_PHRASES)
+    main.voice_loop = loop = main.make_voice_loop()
+    finished = threading.Event()  # ends this run's watcher too, so restarts don't pile them up
+
+    def watch():
+        while not finished.wait(0.5):
+            if stop.is_set():
+                loop.stop()
+                return
+
+    watcher = threading.Thread(target=watch, daemon=True)
+    watcher.start()
+    try:
+        loop.run()
+    finally:
+        finished.set()
+        watcher.join()
+        main.voice_loop = None
+        print(f"[Scheduler] voice latency: {loop.latency_report()}")
+
+
+# 00:30 falls in the 12-3 AM window where strava_sync.main() also captures "yesterday"
+DEFAULT_SYNC_CRON = "30 0 * * *"
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run the activity logger, nightly health sync and voice loop together.")
+    parser.add_argument("--jobs", default="logger,sync,voice", help="comma-separated subset of logger,sync,voice")
+    parser.add_argument("--sync-cron", default=DEFAULT_SYNC_CRON)
+    parser.add_argument("--report-every", type=float, default=600, help="seconds between metrics reports")
+    parser.add_argument("--metrics", help="also write the metrics report to this JSON file")
+    args = parser.parse_args()
+
+    available = {
+        "logger": lambda: Job("logger", run_logger),
+        "sync": lambda: Job("sync", run_sync, cron=args.sync_cron),
+        "voice": lambda: Job("voice", run_voice),
+    }
+    jobs = [available[name.strip()]() for name in args.jobs.split(",") if name.strip()]
+    Scheduler(jobs).run_forever(args.report_every, args.metrics)
@@ -0,0 +1,38 @@
+import io
+import subprocess
+
+import numpy as np
+from PIL import Image
+
+
+def exec_out_screencap(serial=None, adb_path="adb") -> bytes:
+    # One-shot capture for callers without a shell session: PNG bytes straight from stdout
+    cmd = [adb_path] + (["-s", serial] if serial else []) + ["exec-out", "screencap", "-p"]
+    return subprocess.run(cmd, capture_output=True, check=True).stdout
+
+
+def decode_png(data: bytes) -> Image.Image:
+    img = Image.open(io.BytesIO(data))
+    img.load()
+    return img
+
+
+def load_image(src) -> Image.Image:
+    # Accepts a PIL image, raw PNG bytes or a file path
+    if isinstance(src, Image.Image):
+        return src
+    if isinstance(src, (bytes, bytearray)):
+        return decode_png(bytes(src))
+    img = Image.open(src)
+    img.load()
+    return img
+
+
+def capture_image(device=None) -> Image.Image:
+    data = device.screencap() if device is not None else exec_out_screencap()
+    return decode_png(data)
+
+
+def capture_array(device=None, grayscale=False):
+    img = capture_image(device)
+    return np.asarray(img.convert("L" if grayscale else "RGB"))
@@ -0,0 +1,100 @@
+import io
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from core.readiness import dhash, hamming
+
+
+class ScreenshotPipeline:
+    """Grab -> hash -> skip near-duplicates -> encode kept frames on a worker thread.
+
+    Only the grab and a 16x16 dHash run on the caller's thread. Every
+    `png_sample_every`-th kept frame is also PNG-encoded in the worker to
+    estimate what the old full-resolution PNGs would have cost.
+    """
+
+    def __init__(self, folder, grab, max_distance=6, fmt="WEBP", quality=70, png_sample_every=20):
+        self.folder = folder
+        self.grab = grab
+        self.max_distance = max_distance
+        self.fmt = fmt
+        self.quality = quality
+        self.png_sample_every = png_sample_every
+        self.encoder = ThreadPoolExecutor(max_workers=1, thread_name_prefix="screenshot-encode")
+        self.lock = threading.Lock()
+        self.last_hash = None
+        self.captures = 0
+        self.skipped = 0
+        self.kept = 0
+        self.bytes_written = 0
+        self.png_sampled = 0
+        self.png_sample_bytes = 0
+        self.encoded_sample_bytes = 0
+        self.capture_seconds = 0.0
+        self.max_capture_seconds = 0.0
+
+    def capture(self, app):
+        start = time.perf_counter()
+        img = self.grab()
+        h = dhash(img)
+        elapsed = time.perf_counter() - start
+
+        with self.lock:
+            duplicate = self.last_hash is not None and hamming(h, self.last_hash) <= self.max_distance
+            if not duplicate:
+                self.last_hash = h
+            self.captures += 1
+            self.capture_seconds += elapsed
+            self.max_capture_seconds = max(self.max_capture_seconds, elapsed)
+            if duplicate:
+                self.skipped += 1
+                return None
+            self.kept += 1
+            sample_png = (self.kept - 1) % self.png_sample_every == 0  # the 1st, then every n-th
+
+        ts = datetime.now().strftime("%H-%M-%S-%f")[:-3]
+        safe_name = "".join(c for c in app if c.isalnum() or c in (" ", "_", "-")).strip()
+        path = os.path.join(self.folder, f"{ts}__{safe_name}.{self.fmt.lower()}")
+        self.encoder.submit(self._encode, img, path, sample_png)
+        return path
+
+    def _encode(self, img, path, sample_png):
+        try:
+            img = img.convert("RGB")
+            img.save(path, self.fmt, quality=self.quality, method=4 if self.fmt == "WEBP" else 0)
+            size = os.path.getsize(path)
+            png_size = None
+            if sample_png:
+                buf = io.BytesIO()
+                img.save(buf, "PNG")
+                png_size = buf.tell()
+            with self.lock:
+                self.bytes_written += size
+                if png_size:
+                    self.png_sampled += 1
+                    self.png_sample_bytes += png_size
+                    self.encoded_sample_bytes += size
+        except Exception as e:
+            print(f"[Screenshot Error] {e}")
+
+    def stats(self):
+        with self.lock:
+            avg_kept = self.bytes_written / self.kept if self.kept else 0
+            ratio = self.png_sample_bytes / self.encoded_sample_bytes if self.encoded_sample_bytes else 1
+            # What full PNGs for every capture would have cost, minus what was written
+            png_estimate = avg_kept * ratio * self.captures
+            return {
+                "captures": self.captures,
+                "kept": self.kept,
+                "skipped": self.skipped,
+                "bytes_written": self.bytes_written,
+                "bytes_saved_estimate": round(png_estimate - self.bytes_written),
+                "avg_capture_ms": round(1000 * self.capture_seconds / self.captures, 1) if self.captures else 0,
+                "max_capture_ms": round(1000 * self.max_capture_seconds, 1),
+            }
+
+    def close(self):
+        self.encoder.shutdown(wait=True)
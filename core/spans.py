@@ -0,0 +1,200 @@
+import cProfile
+import contextvars
+import inspect
+import json
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime
+from functools import wraps
+from pathlib import Path
+
+# JARVIS_TIMING=1 turns spans on; it is read once at import, so disabled spans
+# cost nothing (decorators return the function unchanged)
+ENABLED = os.environ.get("JARVIS_TIMING", "") not in ("", "0")
+REPORT_DIR = Path(os.environ.get("JARVIS_TIMING_DIR", "timing"))
+MAX_SAMPLES = 10000  # per stage; long logger runs keep the most recent ones
+
+
+class Collector:
+    """Samples of one run (a sync, the logger). Runs sharing a process keep separate collectors,
+    so one run's report neither includes nor clears another's samples."""
+
+    def __init__(self, label=None):
+        self.label = label
+        self.samples = {}
+        self.lock = threading.Lock()
+
+    def record(self, name, seconds):
+        stage = self.samples.get(name)
+        if stage is None:
+            with self.lock:
+                stage = self.samples.setdefault(name, deque(maxlen=MAX_SAMPLES))
+        stage.append(seconds)
+
+    def drain(self):
+        with self.lock:
+            taken = {name: list(values) for name, values in self.samples.items()}
+            self.samples.clear()
+        return taken
+
+
+# Spans outside any collecting() block (and in OCR worker processes) land here
+default = Collector()
+_current = contextvars.ContextVar("spans_collector", default=None)
+
+
+def current():
+    return _current.get() or default
+
+
+@contextmanager
+def collecting(collector):
+    # Spans in this block, and in asyncio tasks / to_thread calls started from it, go to
+    # `collector` (a label makes a new one). Plain threads must enter it themselves.
+    if not isinstance(collector, Collector):
+        collector = Collector(collector)
+    token = _current.set(collector)
+    try:
+        yield collector
+    finally:
+        _current.reset(token)
+
+
+def record(name, seconds):
+    current().record(name, seconds)
+
+
+class Span:
+    def __init__(self, name=None):
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        record(self.name, time.perf_counter() - self.start)
+
+    def __call__(self, fn):
+        name = self.name or fn.__name__
+        if inspect.iscoroutinefunction(fn):
+            @wraps(fn)
+            async def timed_async(*args, **kwargs):
+                start = time.perf_counter()
+                try:
+                    return await fn(*args, **kwargs)
+                finally:
+                    record(name, time.perf_counter() - start)
+            return timed_async
+
+        @wraps(fn)
+        def timed(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                record(name, time.perf_counter() - start)
+        return timed
+
+
+class _NoSpan:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def __call__(self, fn):
+        return fn
+
+
+NO_SPAN = _NoSpan()
+
+
+def span(name=None):
+    """Time a block (`with span("ocr"):`) or every call of a function (`@span()`).
+
+    A decorator without a name uses the function's name.
+    """
+    return Span(name) if ENABLED else NO_SPAN
+
+
+def drain():
+    # Hands recorded samples over (e.g. from an OCR worker process) and clears them
+    return current().drain()
+
+
+def merge(taken, collector=None):
+    collector = collector or current()
+    for name, values in taken.items():
+        for seconds in values:
+            collector.record(name, seconds)
+
+
+def run_traced(fn, *args, **kwargs):
+    # Pool-side half of timed pool jobs: returns the result with the worker's spans
+    result = fn(*args, **kwargs)
+    return result, drain()
+
+
+def _percentile(values, q):
+    return values[min(len(values) - 1, int(q * len(values)))]
+
+
+def report(collector=None):
+    stages = {}
+    for name, values in list((collector or current()).samples.items()):
+        values = sorted(values)
+        if not values:
+            continue
+        stages[name] = {
+            "n": len(values),
+            "total_ms": round(sum(values) * 1000, 1),
+            "p50_ms": round(_percentile(values, 0.5) * 1000, 2),
+            "p95_ms": round(_percentile(values, 0.95) * 1000, 2),
+            "max_ms": round(values[-1] * 1000, 2),
+        }
+    return dict(sorted(stages.items(), key=lambda item: -item[1]["total_ms"]))
+
+
+def write_report(label, collector=None):
+    # timing/<label>_<timestamp>.json from the current run's collector, which then starts over;
+    # no-op while timing is off
+    if not ENABLED:
+        return None
+    collector = collector or current()
+    stages = report(collector)
+    collector.drain()
+    REPORT_DIR.mkdir(parents=True, exist_ok=True)
+    path = REPORT_DIR / f"{label}_{datetime.now():%Y-%m-%d_%H-%M-%S}.json"
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"label": label, "written": datetime.now().isoformat(timespec="seconds"), "stages": stages}, f, indent=2)
+    print(f"[INFO] Timing report: {path}")
+    return path
+
+
+@contextmanager
+def profiled(path=None):
+    # JARVIS_PROFILE=<file> dumps cProfile stats for the block (`python -m pstats <file>`);
+    # path="" turns it off even when the variable is set
+    path = os.environ.get("JARVIS_PROFILE") if path is None else path
+    if not path:
+        yield
+        return
+    profiler = cProfile.Profile()
+    try:
+        profiler.enable()
+    except ValueError as e:
+        # Python 3.12+ allows one active profiler per process
+        print(f"[WARN] cProfile not started for {path}: {e}")
+        yield
+        return
+    try:
+        yield
+    finally:
+        profiler.disable()
+        profiler.dump_stats(path)
+        print(f"[INFO] cProfile stats: {path}")
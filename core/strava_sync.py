@@ -1,26 +1,47 @@
+import argparse
 import json
-from datetime import datetime, timedelta
-import re
 import os
-import subprocess
-import pytesseract
-from PIL import Image
+from datetime import date, datetime, timedelta
+import re
+import threading
 import time
+from contextlib import nullcontext
 from pathlib import Path
 
+from core.adb_transport import REFERENCE_SIZE, default_serial, list_devices, lock_for, open_device, parse_wm_size, scale_point
+from core.health_columns import update_columns
+from core.health_stats import RunningStats
+from core.health_store import HealthStore
+from core.ocr_cache import OcrCache, content_hash
+from core.ocr_pool import make_ocr_pool, tesseract
+from core.readiness import dhash, hamming, matches_template, wait_for_screen, wait_for_stable
+from core.roi_ocr import extract_heart_roi, extract_sleep_roi, extract_stress_roi, read_day_label
+from core.screencap import capture_image, load_image
+from core.spans import collecting, profiled, span, write_report
+
 file_path = Path("E:/Jarvis/health_logs/health_data.json")
 package_name = "com.ido.noise"
 
-# Path to Tesseract
-pytesseract.pytesseract.tesseract_cmd = r"C:\Program Files\Tesseract-OCR\tesseract.exe"
+# Full-frame OCR results keyed by frame hash; JARVIS_OCR_CACHE=<file> keeps them across runs
+ocr_cache = OcrCache()
 
-def extract_stress_info_from_full_image(screenshot_path: str):
+def load_ocr_cache():
+    # Called by sync()/sync_all(), not at import; the file is read once per process
+    path = os.environ.get("JARVIS_OCR_CACHE")
+    with ocr_cache.lock:
+        if path and ocr_cache.path is None:
+            ocr_cache.path = Path(path)
+            if ocr_cache.path.exists():
+                ocr_cache.load()
+
+@span()
+def extract_stress_info_from_full_image(screenshot):
     try:
-        # Load full image
-        img = Image.open(screenshot_path)
+        # Accepts the captured frame itself or a path to a saved screenshot
+        img = load_image(screenshot)
 
         # OCR the whole image
-        ocr = pytesseract.image_to_string(img)
+        ocr = tesseract().image_to_string(img)
         print("[DEBUG] Full OCR for STRESS:\n", ocr)
 
         # Match "Average 31" or "Avg: 31" or "31 Normal"
@@ -50,14 +71,51 @@ def extract_stress_info_from_full_image(screenshot_path: str):
 
 
 def pull_and_read_screen(screen_type: str, label: str = "the screen") -> str:
-    os.system("adb shell screencap -p /sdcard/ss_temp.png")
-    os.system("adb pull /sdcard/ss_temp.png")
-    img = Image.open("ss_temp.png")
-    ocr_text = pytesseract.image_to_string(img)
+    img = settled_screenshot()
+    ocr_text = tesseract().image_to_string(img)
     print(f"\n[DEBUG] OCR for {label.upper()}:\n{ocr_text}\n{'-' * 40}")
     return ocr_text
 
 
+def stress_from_info(avg, rng):
+    return {
+        "avg_stress": int(avg) if avg.isdigit() else None,
+        "min_stress": int(rng.split("–")[0]) if "–" in rng else None,
+        "max_stress": int(rng.split("–")[1]) if "–" in rng else None,
+    }
+
+
+# Cropped-region OCR first; the full-frame parsers only run when a value is missing.
+# These take a captured frame so they can run in OCR worker processes.
+@span()
+def parse_heart_frame(frame, label):
+    heart = extract_heart_roi(frame)
+    if None in heart.values():
+        print(f"[DEBUG] ROI OCR incomplete for {label}, falling back to full frame.")
+        heart = extract_heart_data(ocr_text(frame, reuse_similar=False))
+    print(f"[DEBUG] {label}: {heart}")
+    return heart
+
+@span()
+def parse_stress_frame(frame, label):
+    stress = extract_stress_roi(frame)
+    if None in stress.values():
+        print(f"[DEBUG] ROI OCR incomplete for {label}, falling back to full frame.")
+        stress = stress_from_info(*extract_stress_info_from_full_image(frame))
+    print(f"[DEBUG] {label}: {stress}")
+    return stress
+
+@span()
+def parse_sleep_frame(frame, label):
+    sleep = extract_sleep_roi(frame)
+    if "?" in sleep.values():
+        print(f"[DEBUG] ROI OCR incomplete for {label}, falling back to full frame.")
+        sleep = extract_sleep_data(ocr_text(frame, reuse_similar=False))
+    print(f"[DEBUG] {label}: {sleep}")
+    return sleep
+
+
+@span()
 def extract_heart_data(text):
     bpm_avg = re.search(r"Average\s+(\d+)", text)
     bpm_range = re.search(r"(\d{2,3})-(\d{2,3})\s*bpm", text)
@@ -68,6 +126,7 @@ def extract_heart_data(text):
         "max_bpm": int(bpm_range.group(2)) if bpm_range else None
     }
 
+@span()
 def extract_stress_data(ocr_text):
     lines = ocr_text.splitlines()
     avg_stress = "?"
@@ -97,6 +156,7 @@ def extract_stress_data(ocr_text):
         "max_stress": int(max_stress) if max_stress.isdigit() else None
     }
 
+@span()
 def extract_sleep_data(text):
     bedtime = re.search(r"Bedtime\s+(\d{1,2}:\d{2}\s*[AP]M)", text)
     wake_time = re.search(r"Wake-up time\s+(\d{1,2}:\d{2}\s*[AP]M)", text)
@@ -106,66 +166,126 @@ def extract_sleep_data(text):
         "wake_time": wake_time.group(1) if wake_time else "?"
     }
 
+@span()
 def wait_until_noisefit_detected(timeout_seconds=60):
     print("[*] Waiting for NoiseFit Assist to be active...")
     start_time = time.time()
-    
+
     while time.time() - start_time < timeout_seconds:
-        if noisefit_is_open():
+        remaining = timeout_seconds - (time.time() - start_time)
+        frame = wait_for_screen(get_device(), "noisefit_home", timeout=remaining, package=session.package)
+        if frame is None:
+            break
+        # Full OCR only once focus, a settled frame and the header region all agree
+        if noisefit_is_open(frame):
             return True
-        else:
-            print("[x] Not detected. Retrying...")
+        print("[x] Not detected. Retrying...")
+        time.sleep(0.5)
 
     print("[!] Timeout reached. Could not detect NoiseFit Assist.")
     return False
 
-def noisefit_is_open():
-    take_screenshot("check.png")
-    text = ocr_text("check.png")
+def noisefit_is_open(frame=None):
+    text = ocr_text(frame if frame is not None else take_screenshot())
     print("[OCR Check] Text:", text[:200])  # Print partial text for debug
     return "NoiseFit Assist" in text
 
-log_folder = Path("health_logs")
-log_folder.mkdir(exist_ok=True)
-DATA_FILE = log_folder / "health_data.json"
+log_folder = Path("health_logs")  # created by the first run that writes to it
+DATA_FILE = log_folder / "health_data.json"  # legacy; import with `python -m core.health_store`
+DB_FILE = log_folder / "health.db"
+PROFILES_FILE = log_folder / "devices.json"  # {"default": person, serial: {"person", "size": [w, h], "package"}}
 
-def update_health_data(date_str, heart, stress, sleep=None):
-    # Load existing data or start fresh
-    try:
-        with open(DATA_FILE, "r") as f:
-            data = json.load(f)
-    except FileNotFoundError:
-        data = {}
 
-    # Ensure key exists
-    if date_str not in data:
-        data[date_str] = {}
+class Session(threading.local):
+    """The phone this thread drives and where its results go; each fan-out thread has its own.
+
+    The class attributes are the single-phone defaults (no serial, health_logs/).
+    """
+    serial = None
+    folder = log_folder
+    package = package_name
+    size = None      # screen resolution; from the profile, else asked with `wm size`
+    device = None
+    store = None
+    pool = None      # OCR pool shared by a fan-out; None = each run makes its own
 
-    # Update heart and stress if available
+
+session = Session()
+
+
+def use_device(serial=None, profile=None, default_person=None):
+    # A profile's "person" (default: the serial) namespaces the output: health_logs/<person>/,
+    # except the default person, whose data stays in health_logs/ itself
+    profile = profile or {}
+    person = profile.get("person", serial)
+    session.serial = serial
+    session.folder = log_folder if person is None or person == default_person else log_folder / person
+    session.folder.mkdir(parents=True, exist_ok=True)
+    session.package = profile.get("package", package_name)
+    session.size = tuple(profile["size"]) if "size" in profile else None
+    session.device = None
+    session.store = None
+    session.pool = None
+
+
+def ocr_pool():
+    # The fan-out's shared pool (shut down by sync_all, not here), else one for this run
+    return nullcontext(session.pool) if session.pool is not None else make_ocr_pool()
+
+
+def load_profiles(path=PROFILES_FILE):
+    path = Path(path)
+    if not path.exists():
+        return {}
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def default_person(serial, profiles):
+    # devices.json "default"; the first phone ever synced claims it, so the history a single phone
+    # built up in health_logs/ stays there when a second phone is plugged in
+    if not profiles.get("default"):
+        profiles["default"] = profiles.get(serial, {}).get("person", serial)
+        PROFILES_FILE.parent.mkdir(parents=True, exist_ok=True)
+        with open(PROFILES_FILE, "w", encoding="utf-8") as f:
+            json.dump(profiles, f, indent=2)
+        print(f"[INFO] {profiles['default']} is the default person (health_logs/); change \"default\" in {PROFILES_FILE} to pick another")
+    return profiles["default"]
+
+
+def get_health_store():
+    if session.store is None:
+        session.store = HealthStore(session.folder / "health.db")
+    return session.store
+
+def health_record(heart, stress, sleep=None):
+    record = {}
     if heart:
-        data[date_str].update({
+        record.update({
             "avg_bpm": heart.get("avg_bpm"),
             "min_bpm": heart.get("min_bpm"),
             "max_bpm": heart.get("max_bpm"),
         })
     if stress:
-        data[date_str].update({
+        record.update({
             "avg_stress": stress.get("avg_stress"),
             "min_stress": stress.get("min_stress"),
             "max_stress": stress.get("max_stress"),
         })
     if sleep:
-        data[date_str].update({
+        record.update({
             "sleep_duration": sleep.get("duration"),
             "bedtime": sleep.get("bedtime"),
             "wakeup": sleep.get("wakeup")
         })
+    return record
 
-    # Save updated data
-    with open(DATA_FILE, "w") as f:
-        json.dump(data, f, indent=2)
-
-    return data
+@span()
+def update_health_data(date_str, heart, stress, sleep=None):
+    # Single-row upsert: cost doesn't grow with the history and the write is atomic
+    store = get_health_store()
+    store.upsert(date_str, health_record(heart, stress, sleep))
+    return store.get(date_str)
 
 
 from datetime import datetime, timedelta
@@ -207,31 +327,11 @@ def merge_sleep_data(today: dict, yesterday: dict) -> dict:
         "wakeup": wakeup,
     }
 
-def compute_overall_stats(data):
-    avg_bpm_list = []
-    min_bpm_list = []
-    max_bpm_list = []
-
-    avg_stress_list = []
-    min_stress_list = []
-    max_stress_list = []
-
-    for entry in data.values():
-        if entry["avg_bpm"]: avg_bpm_list.append(entry["avg_bpm"])
-        if entry["min_bpm"]: min_bpm_list.append(entry["min_bpm"])
-        if entry["max_bpm"]: max_bpm_list.append(entry["max_bpm"])
-        if entry["avg_stress"]: avg_stress_list.append(entry["avg_stress"])
-        if entry["min_stress"]: min_stress_list.append(entry["min_stress"])
-        if entry["max_stress"]: max_stress_list.append(entry["max_stress"])
-
-    return {
-        "overall_avg_bpm": sum(avg_bpm_list) // len(avg_bpm_list) if avg_bpm_list else "?",
-        "overall_min_bpm": min(min_bpm_list) if min_bpm_list else "?",
-        "overall_max_bpm": max(max_bpm_list) if max_bpm_list else "?",
-        "overall_avg_stress": sum(avg_stress_list) // len(avg_stress_list) if avg_stress_list else "?",
-        "overall_min_stress": min(min_stress_list) if min_stress_list else "?",
-        "overall_max_stress": max(max_stress_list) if max_stress_list else "?",
-    }
+def compute_overall_stats(data=None):
+    # Running totals from the store; pass a {date: entry} dict to compute over that instead
+    if data is None:
+        return get_health_store().stats().overall()
+    return RunningStats.from_records(data).overall()
 
 def merge_heart_data(today: dict, yesterday: dict) -> dict:
     def safe_int(val):
@@ -257,54 +357,99 @@ def merge_stress_data(today, yesterday):
         "max_stress": max(filter(None, [today["max_stress"], yesterday["max_stress"]])),
     }
 
+# One shell session for the whole run instead of an adb process per command
+def get_device():
+    if session.device is None:
+        session.device = open_device(session.serial)
+        if session.size is None:
+            session.size = parse_wm_size(session.device.call("wm size")) or REFERENCE_SIZE
+    return session.device
+
 def adb(cmd):
-    os.system(f"adb shell {cmd}")
+    get_device().send(cmd)
 
+@span()
 def tap(x, y):
-    os.system(f"adb shell input tap {x} {y}")
+    # Coordinates are given for the 1080x2340 reference screen
+    device = get_device()
+    x, y = scale_point(x, y, session.size)
+    device.send(f"input tap {x} {y}")
     time.sleep(0.3)
 
-def swipe(x1, y1, x2, y2, duration=300):
-    os.system(f"adb shell input swipe {x1} {y1} {x2} {y2} {duration}")
-    time.sleep(0.5)
-
-def take_screenshot(name="temp.png"):
-    result = os.system(f"adb exec-out screencap -p > {name}")
-    time.sleep(0.5)
-    if not os.path.exists(name) or os.path.getsize(name) < 1000:
-        print(f"[ERROR] Screenshot {name} failed or is empty.")
+@span()
+def swipe(x1, y1, x2, y2, duration=300, pause=0.5):
+    # Coordinates are given for the 1080x2340 reference screen
+    device = get_device()
+    x1, y1 = scale_point(x1, y1, session.size)
+    x2, y2 = scale_point(x2, y2, session.size)
+    device.send(f"input swipe {x1} {y1} {x2} {y2} {duration}")
+    time.sleep(pause)
+
+@span()
+def take_screenshot(save_as=None):
+    # Frames stay in memory; pass save_as only when a copy on disk is wanted for debugging
+    try:
+        img = capture_image(get_device())
+    except Exception as e:
+        print(f"[ERROR] Screenshot failed: {e}")
         return None
-    return name
+    if save_as:
+        img.save(save_as)
+    return img
+
+@span()
+def settled_screenshot(timeout=5):
+    # Waits for the page transition to finish instead of a fixed sleep
+    return wait_for_stable(get_device(), timeout=timeout)
 
 
-def ocr_without_top_lines(image_path, skip_lines=2):
-    text = pytesseract.image_to_string(Image.open(image_path)).strip()
+def ocr_without_top_lines(image, skip_lines=2):
+    text = tesseract().image_to_string(load_image(image)).strip()
     lines = text.splitlines()
     return "\n".join(lines[skip_lines:])
 
-def ocr_text(image_path):
-    if not os.path.exists(image_path) or os.path.getsize(image_path) < 1000:
-        print(f"[ERROR] OCR failed: '{image_path}' not found or is invalid.")
+@span("tesseract_full")
+def tesseract_full(img):
+    return tesseract().image_to_string(img).strip()
+
+@span()
+def ocr_text(image, reuse_similar=True):
+    # reuse_similar: near-identical frames share a result, fine for "which page is this"
+    # checks. Value parsing passes False so only a pixel-identical frame is reused.
+    if image is None:
+        print("[ERROR] OCR failed: no screenshot to read.")
         return ""
     try:
-        return pytesseract.image_to_string(Image.open(image_path)).strip()
+        img = load_image(image)
+        if reuse_similar:
+            return ocr_cache.cached("full", img, tesseract_full)
+        key = content_hash(img.tobytes())
+        text = ocr_cache.get("exact", key, near=False)
+        if text is None:
+            text = tesseract_full(img)
+            ocr_cache.put("exact", key, text)
+        return text
     except Exception as e:
-        print(f"[ERROR] Failed to OCR '{image_path}': {e}")
+        print(f"[ERROR] Failed to OCR screenshot: {e}")
         return ""
 
+@span()
 def swipe_to_yesterday_tab(retries=5, delay=1):
     print("[*] Attempting to swipe to 'Yesterday' tab...")
 
     for attempt in range(1, retries + 1):
         print(f"[>] Swipe attempt {attempt}")
-        adb("input swipe 200 1000 900 1000 200")  # swipe right to left
-        time.sleep(delay)
+        swipe(200, 1000, 900, 1000, 200, pause=0)  # swipe right to left; wait_for_stable does the waiting
+        frame = wait_for_stable(get_device(), timeout=delay * 3)
 
-        take_screenshot("after.png")
-        text = ocr_text("after.png")
-        print("[=] OCR result:\n", text)
+        found = matches_template(frame, "yesterday_label")
+        if found is None:
+            # No reference image for the label: fall back to OCR
+            text = ocr_text(frame)
+            print("[=] OCR result:\n", text)
+            found = "Yesterday" in text
 
-        if "Yesterday" in text:
+        if found:
             print("[✓] Swipe success — 'Yesterday' detected.")
             return True
         else:
@@ -313,12 +458,13 @@ def swipe_to_yesterday_tab(retries=5, delay=1):
     print("[!] Failed to detect 'Yesterday' tab after all attempts.")
     return False
 
+@span()
 def main():
     now = datetime.now()
     check_yesterday = 0 <= now.hour < 3
 
-    log_folder = Path("health_logs")
-    log_folder.mkdir(exist_ok=True)
+    log_folder = session.folder
+    log_folder.mkdir(parents=True, exist_ok=True)
 
     today = now
 
@@ -333,61 +479,54 @@ def main():
 
     print("Importing new data.")
     swipe(55, 430, 55, 2305, 300)
-    time.sleep(5)
+    settled_screenshot()
     while True:
         if wait_until_noisefit_detected():
             break
 
-    # --- HEART ---
-    print("\n🫠 Switching to TODAY'S HEART tab...")
-    tap(800, 1600)
-    heart_text_today = pull_and_read_screen("heart", "today's HEART screen")
-    heart_today = extract_heart_data(heart_text_today)
-
-    if check_yesterday:
-        print("\n🫠 Switching to YESTERDAY'S HEART tab...")
-        swipe_to_yesterday_tab()
-        heart_text_yesterday = pull_and_read_screen("heart", "yesterday's HEART screen")
-        heart_yesterday = extract_heart_data(heart_text_yesterday)
-        heart = merge_heart_data(heart_today, heart_yesterday)
-    else:
-        heart = heart_today
-    tap(80, 170)
-    swipe(55, 1974, 55, 121, 300)
-
-    # --- STRESS ---
-    print("\n🪠 Switching to TODAY'S STRESS tab...")
-    tap(305, 940)
-    pull_and_read_screen("stress", "today's STRESS screen")
-    avg_today, rng_today = extract_stress_info_from_full_image("ss_temp.png")
-    stress_today = {
-        "avg_stress": int(avg_today) if avg_today.isdigit() else None,
-        "min_stress": int(rng_today.split("–")[0]) if "–" in rng_today else None,
-        "max_stress": int(rng_today.split("–")[1]) if "–" in rng_today else None,
-    }
+    # Navigation stays on this thread; each captured frame is handed to the OCR
+    # pool so Tesseract runs while the phone animates to the next screen.
+    jobs = {}
+    with ocr_pool() as pool:
+        # --- HEART ---
+        print("\n🫠 Switching to TODAY'S HEART tab...")
+        tap(800, 1600)
+        jobs["heart_today"] = pool.submit(parse_heart_frame, settled_screenshot(), "today's HEART screen")
+
+        if check_yesterday:
+            print("\n🫠 Switching to YESTERDAY'S HEART tab...")
+            swipe_to_yesterday_tab()
+            jobs["heart_yesterday"] = pool.submit(parse_heart_frame, settled_screenshot(), "yesterday's HEART screen")
+        tap(80, 170)
+        swipe(55, 1974, 55, 121, 300)
+
+        # --- STRESS ---
+        print("\n🪠 Switching to TODAY'S STRESS tab...")
+        tap(305, 940)
+        jobs["stress_today"] = pool.submit(parse_stress_frame, settled_screenshot(), "today's STRESS screen")
+
+        if check_yesterday:
+            print("\n🪠 Switching to YESTERDAY'S STRESS tab...")
+            swipe_to_yesterday_tab()
+            jobs["stress_yesterday"] = pool.submit(parse_stress_frame, settled_screenshot(), "yesterday's STRESS screen")
+        tap(80, 170)
+        swipe(55, 430, 55, 2305, 300)
+
+        # --- SLEEP ---
+        print("\n🛌 Opening the SLEEP tab...")
+        tap(310, 1600)
+        jobs["sleep"] = pool.submit(parse_sleep_frame, settled_screenshot(), "SLEEP screen")
+
+        results = {name: job.result() for name, job in jobs.items()}
 
     if check_yesterday:
-        print("\n🪠 Switching to YESTERDAY'S STRESS tab...")
-        swipe_to_yesterday_tab()
-        time.sleep(5)
-        pull_and_read_screen("stress", "yesterday's STRESS screen")
-        avg_yst, rng_yst = extract_stress_info_from_full_image("ss_temp.png")
-        stress_yesterday = {
-            "avg_stress": int(avg_yst) if avg_yst.isdigit() else None,
-            "min_stress": int(rng_yst.split("–")[0]) if "–" in rng_yst else None,
-            "max_stress": int(rng_yst.split("–")[1]) if "–" in rng_yst else None,
-        }
-        stress = merge_stress_data(stress_today, stress_yesterday)
+        heart = merge_heart_data(results["heart_today"], results["heart_yesterday"])
+        stress = merge_stress_data(results["stress_today"], results["stress_yesterday"])
     else:
-        stress = stress_today
-    tap(80, 170)
-    swipe(55, 430, 55, 2305, 300)
+        heart = results["heart_today"]
+        stress = results["stress_today"]
 
-    # --- SLEEP ---
-    print("\n🛌 Opening the SLEEP tab...")
-    tap(310, 1600)
-    sleep_text = pull_and_read_screen("sleep", "SLEEP screen")
-    sleep_raw = extract_sleep_data(sleep_text)
+    sleep_raw = results["sleep"]
     computed_sleep = merge_sleep_data({
         "bedtime": sleep_raw.get("bedtime"),
         "wakeup": sleep_raw.get("wake_time")
@@ -420,17 +559,249 @@ def main():
     if sleep_raw.get("bedtime") != "?" and sleep_raw.get("wake_time") != "?":
         update_health_data(sleep_date, {}, {}, sleep=computed_sleep)
 
-    subprocess.run(["adb", "shell", "am", "force-stop", package_name])
+    adb(f"am force-stop {session.package}")
     print("App closed.")
 
 
-# Example usage inside your main:
+# --- BACKFILL: many past days in one app session ---
+
+def parse_day_range(text):
+    start, _, end = text.partition("..")
+    start = date.fromisoformat(start)
+    end = date.fromisoformat(end or start.isoformat())
+    if end < start:
+        start, end = end, start
+    return start, end
+
+DAY_FORMATS = ("%Y-%m-%d", "%Y/%m/%d", "%m/%d", "%b %d", "%d %b", "%B %d", "%d %B")
+
+def day_from_label(text, today):
+    # "Today", "Yesterday" or a date; one without a year is the latest such date not after today
+    text = text.strip().rstrip(".,")
+    lowered = text.lower()
+    if "yesterday" in lowered:
+        return today - timedelta(days=1)
+    if "today" in lowered:
+        return today
+    for fmt in DAY_FORMATS:
+        try:
+            parsed = datetime.strptime(text, fmt).date()
+        except ValueError:
+            continue
+        if "%Y" not in fmt:
+            parsed = parsed.replace(year=today.year)
+            if parsed > today:
+                parsed = parsed.replace(year=today.year - 1)
+        return parsed
+    return None
+
+def shown_label(frame):
+    # The date line under the value; "" when it can't be read
+    try:
+        return read_day_label(frame)
+    except Exception as e:
+        print(f"[ERROR] Day label OCR failed: {e}")
+        return ""
+
+def step_back_one_day(frame, label, retries=3):
+    # Same swipe as swipe_to_yesterday_tab. The page has moved when its date label changes
+    # (two empty days look alike as whole frames); the frame hash is only the fallback
+    # when a label can't be read. Returns (frame, label), or (None, None) when stuck.
+    before = dhash(frame)
+    for attempt in range(1, retries + 1):
+        swipe(200, 1000, 900, 1000, 200, pause=0)
+        frame = wait_for_stable(get_device(), timeout=3)
+        new_label = shown_label(frame)
+        if new_label and label:
+            moved = new_label != label
+        else:
+            moved = hamming(dhash(frame), before) > 6
+        if moved:
+            return frame, new_label
+        print(f"[x] Swipe {attempt} did not change the day. Retrying...")
+    return None, None
+
+def walk_back_days(wanted, parse_frame, pool, label):
+    # Start on today's tab and swipe back until the oldest wanted day, capturing only wanted days.
+    # Each page is dated by its label, so a swipe that skips a day can't shift the dates;
+    # pages whose label can't be read are dated by counting swipes.
+    jobs = {}
+    if not wanted:
+        return jobs
+    today = datetime.now().date()
+    oldest = min(wanted)
+    expected = today
+    frame = settled_screenshot()
+    text = shown_label(frame)
+    while True:
+        day = day_from_label(text, today) or expected
+        if day > expected:
+            print(f"[!] {label}: swiped back but the page shows {day}, after {expected}; stopping here.")
+            break
+        if day != expected:
+            print(f"[!] {label}: expected {expected}, the page shows {day}.")
+        if day in wanted and day not in jobs:
+            jobs[day] = pool.submit(parse_frame, frame, f"{label} {day}")
+        if day <= oldest:
+            break
+        frame, text = step_back_one_day(frame, text)
+        if frame is None:
+            print(f"[!] Stuck on {day} in {label}; older days are left for the next run.")
+            break
+        expected = day - timedelta(days=1)
+    return jobs
+
+def missing_days(store, days, field, shift=0):
+    # Days whose record lacks `field`, shifted to the day tab that shows them
+    return {d + timedelta(days=shift) for d in days if field not in (store.get(d.isoformat()) or {})}
+
+@span()
+def backfill(start, end):
+    store = get_health_store()
+    days = [start + timedelta(days=i) for i in range((end - start).days + 1)]
+    # Sleep shown on day D's tab belongs to the night of D-1, as in main()
+    need_heart = missing_days(store, days, "avg_bpm")
+    need_stress = missing_days(store, days, "avg_stress")
+    need_sleep = missing_days(store, days, "bedtime", shift=1)
+    print(f"[INFO] Backfilling {start}..{end}: {len(need_heart)} heart, {len(need_stress)} stress, {len(need_sleep)} sleep days missing.")
+
+    with ocr_pool() as pool:
+        print("\n🫠 Walking back through HEART days...")
+        tap(800, 1600)
+        heart_jobs = walk_back_days(need_heart, parse_heart_frame, pool, "HEART")
+        tap(80, 170)
+        swipe(55, 1974, 55, 121, 300)
+
+        print("\n🪠 Walking back through STRESS days...")
+        tap(305, 940)
+        stress_jobs = walk_back_days(need_stress, parse_stress_frame, pool, "STRESS")
+        tap(80, 170)
+        swipe(55, 430, 55, 2305, 300)
+
+        print("\n🛌 Walking back through SLEEP days...")
+        tap(310, 1600)
+        sleep_jobs = walk_back_days(need_sleep, parse_sleep_frame, pool, "SLEEP")
+        tap(80, 170)
+
+        records = {}
+        for day, job in heart_jobs.items():
+            records.setdefault(day.isoformat(), {}).update(health_record(job.result(), {}))
+        for day, job in stress_jobs.items():
+            records.setdefault(day.isoformat(), {}).update(health_record({}, job.result()))
+        for day, job in sleep_jobs.items():
+            raw = job.result()
+            if raw.get("bedtime") == "?" or raw.get("wake_time") == "?":
+                continue
+            sleep = merge_sleep_data({"bedtime": raw["bedtime"], "wakeup": raw["wake_time"]}, {})
+            night = (day - timedelta(days=1)).isoformat()
+            records.setdefault(night, {}).update(health_record({}, {}, sleep=sleep))
+
+    # One transaction for the whole backfill
+    store.upsert_many(records, overwrite=False)
+    print(f"[INFO] Backfill committed {len(records)} day records.")
+
+    adb(f"am force-stop {session.package}")
+    print("App closed.")
+
+
+def sync(backfill_range=None, serial=None, timing=True, pool=None, profiles=None):
+    # One full session on one phone: launch the app, capture, close. Holds that phone's
+    # lock so other jobs (the logger's phone probe) stay off it meanwhile.
+    # The output folder and lock follow from the serial alone, however many phones are attached.
+    # JARVIS_TIMING=1 writes a per-stage timing report, JARVIS_PROFILE=<file> a cProfile dump.
+    serial = serial or default_serial()
+    if serial is None:
+        raise RuntimeError("No phone to sync: none attached, or several (pass --serial or use --all-devices)")
+    profiles = load_profiles() if profiles is None else profiles
+    load_ocr_cache()
+    use_device(serial, profiles.get(serial), default_person(serial, profiles))
+    session.pool = pool
+    started = time.time()
+    touched = {}  # date -> whole row, for every day this run writes
+    with lock_for(serial), collecting("sync") if timing else nullcontext(), profiled() if timing else nullcontext():
+        try:
+            get_health_store().listeners.append(lambda date_str, row: touched.__setitem__(date_str, row or {}))
+            adb(f"monkey -p {session.package} -c android.intent.category.LAUNCHER 1")
+            if wait_until_noisefit_detected():
+                print("[INFO] Proceed with data extraction...")
+                if backfill_range:
+                    backfill(*backfill_range)
+                else:
+                    main()
+                # Columnar copy for range queries (python -m core.health_columns mean avg_stress)
+                update_columns(touched, session.folder / "columns", get_health_store().all)
+            else:
+                # Raised so the scheduler's retry/backoff covers the usual failure
+                raise RuntimeError("NoiseFit not detected. Aborting.")
+            get_device().sync()
+            print(f"[INFO] {serial} finished in {time.time() - started:.1f}s ({session.device.commands_sent} adb commands)")
+        finally:
+            print(f"[INFO] OCR cache: {ocr_cache.stats()}")
+            ocr_cache.save()
+            if session.device is not None:
+                session.device.close()
+                session.device = None
+            if session.store is not None:
+                session.store.close()
+                session.store = None
+            if timing:
+                write_report("sync")
+
+
+def profile_path(serial):
+    # JARVIS_PROFILE=sync.prof -> sync_<serial>.prof, one per fan-out thread (cProfile sees only its own thread)
+    path = os.environ.get("JARVIS_PROFILE")
+    if not path:
+        return None
+    path = Path(path)
+    return str(path.with_name(f"{path.stem}_{serial}{path.suffix}"))
+
+
+def sync_all(backfill_range=None, serials=None):
+    # One thread per attached phone, so the run takes as long as the slowest phone.
+    # Navigation is mostly waiting on the device; OCR goes to one pool shared by all of them.
+    serials = serials or list_devices()
+    profiles = load_profiles()
+    if serials:
+        default_person(serials[0], profiles)  # claimed here, not raced for by the threads
+    load_ocr_cache()
+    results = {}
+
+    def run(serial, pool, collector):
+        started = time.time()
+        try:
+            with collecting(collector), profiled(profile_path(serial) or ""):
+                sync(backfill_range, serial, timing=False, pool=pool, profiles=profiles)
+            results[serial] = {"ok": True}
+        except Exception as e:
+            print(f"[ERROR] {serial}: {e}")
+            results[serial] = {"ok": False, "error": str(e)}
+        results[serial]["seconds"] = round(time.time() - started, 1)
+
+    started = time.time()
+    with collecting("sync_all") as collector, make_ocr_pool() as pool:
+        # Start the workers before any sync thread exists: a worker forked while another
+        # thread holds a lock (e.g. the OCR cache's) would inherit it held and deadlock
+        pool.submit(int).result()
+        threads = [threading.Thread(target=run, args=(serial, pool, collector), name=f"sync-{serial}")
+                   for serial in serials]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        print(f"[INFO] {len(serials)} devices synced in {time.time() - started:.1f}s: {results}")
+        write_report("sync_all")
+    return results
+
+
 if __name__ == "__main__":
-    subprocess.run(["adb", "shell", "monkey", "-p", package_name, "-c", "android.intent.category.LAUNCHER", "1"])
-    time.sleep(5)
-    if wait_until_noisefit_detected():
-        print("[INFO] Proceed with data extraction...")
-        main()
+    parser = argparse.ArgumentParser(description="Pull heart, stress and sleep data from the NoiseFit app.")
+    parser.add_argument("--backfill", metavar="START..END", help="capture every day in this range (YYYY-MM-DD..YYYY-MM-DD) in one session")
+    parser.add_argument("--serial", help="sync only this phone (needed when several are attached)")
+    parser.add_argument("--all-devices", action="store_true", help="sync every attached phone concurrently")
+    args = parser.parse_args()
+    backfill_range = parse_day_range(args.backfill) if args.backfill else None
+    if args.all_devices:
+        sync_all(backfill_range)
     else:
-        print("[INFO] NoiseFit not detected. Aborting.")
-
+        sync(backfill_range, args.serial)
@@ -1,35 +1,90 @@
 # main.py
 
-from voice.listen import VoiceRecognizer
-from voice.speak import *
+import os
 
-generate_audio("Hello, I am now using ElevenLabs.")
+from utils.commands import CommandRegistry
+from utils.tts_cache import CachedSpeaker, TtsCache, engine_from_env
 
-def process_command(command: str):
-    command = command.lower()
-    if "log" in command or "activity" in command:
-        generate_audio("Activity is already being logged in the background.")
-    elif "screenshot" in command:
-        generate_audio("Screenshots will be captured during log activity.")
-    elif "exit" in command or "shutdown" in command:
-        generate_audio("Shutting down. Goodbye!")
-        return False
-    elif "hello" in command or "hi" in command:
-        generate_audio("Hello! How can I assist you today?")
+# Fixed responses, synthesized in the background at startup
+STATIC_PHRASES = [
+    "Jarvis is online!",
+    "Hello Tanishk.",
+    "Sorry, I didn't understand that.",
+    "Activity is already being logged in the background.",
+    "Screenshots will be captured during log activity.",
+    "Shutting down. Goodbye!",
+    "Hello! How can I assist you today?",
+]
+
+# Synthesized audio is reused across runs; JARVIS_TTS=stub works offline.
+# The engine is set up on first use, so importing this module stays cheap.
+speaker = None
+voice_loop = None  # set while the pipelined loop runs; replies then go through its playback worker
+
+def get_speaker():
+    global speaker
+    if speaker is None:
+        speaker = CachedSpeaker(engine_from_env(), TtsCache("voice_cache"))
+    return speaker
+
+def say(text):
+    if voice_loop is not None:
+        voice_loop.say(text)
     else:
-        generate_audio("Sorry, I didn't understand that.")
-    return True
+        get_speaker().say(text)
+
+# Registration order is priority order, as in the old if/elif chain
+commands = CommandRegistry()
+
+@commands.register("log", "logs", "logging", "activity")
+def activity_command(command):
+    say("Activity is already being logged in the background.")
+
+@commands.register("screenshot", "screenshots")
+def screenshot_command(command):
+    say("Screenshots will be captured during log activity.")
+
+@commands.register("exit", "shutdown", "shut down")
+def exit_command(command):
+    say("Shutting down. Goodbye!")
+    return False
+
+@commands.register("hello", "hi")
+def greeting_command(command):
+    say("Hello! How can I assist you today?")
+
+def process_command(command: str):
+    matched = commands.match(command)
+    if matched is None:
+        say("Sorry, I didn't understand that.")
+        return True
+    _, handler = matched
+    return handler(command) is not False
+
+def make_voice_loop():
+    # JARVIS_VOICE_WAV=a.wav,b.wav replays recordings instead of the microphone
+    from utils.voice_loop import MicSource, SilentPlayer, SoundDevicePlayer, VoiceLoop, VoskStream, WavSource
+
+    wavs = os.environ.get("JARVIS_VOICE_WAV")
+    source = WavSource(wavs.split(",")) if wavs else MicSource()
+    return VoiceLoop(
+        source,
+        VoskStream(os.environ.get("JARVIS_VOSK_MODEL", "model")),
+        dispatch=process_command,
+        match=commands.match,
+        speaker=get_speaker(),
+        player=SilentPlayer() if wavs else SoundDevicePlayer(),
+        # How loud the speakers come back into the mic; speech must be louder to interrupt a reply
+        echo_threshold=float(os.environ.get("JARVIS_ECHO_THRESHOLD", "2000")),
+    )
 
 if __name__ == "__main__":
-    generate_audio("Jarvis is online!")
-    time.sleep(1)
-    recognizer = VoiceRecognizer()
-    generate_audio("Hello Tanishk.")
-    time.sleep(1)
-
-
-    while True:
-        command = recognizer.listen_once()
-        print(f"[You said] → {command}")
-        if not process_command(command):
-            break
+    get_speaker().prewarm(STATIC_PHRASES)
+    voice_loop = make_voice_loop()
+    say("Jarvis is online!")
+    say("Hello Tanishk.")
+    try:
+        voice_loop.run()
+    except KeyboardInterrupt:
+        voice_loop.stop()
+    print(f"[INFO] Latency: {voice_loop.latency_report()}")
@@ -0,0 +1,73 @@
+import re
+
+
+def trie_pattern(words):
+    # "log", "logs", "logging" -> "log(?:ging|s)?": each position only tries
+    # the characters that can follow, instead of every keyword in turn
+    trie = {}
+    for word in words:
+        node = trie
+        for ch in word:
+            node = node.setdefault(ch, {})
+        node[""] = {}
+
+    def emit(node):
+        alts = [re.escape(ch) + emit(child) for ch, child in sorted(node.items()) if ch]
+        if not alts:
+            return ""
+        body = alts[0] if len(alts) == 1 else "(?:" + "|".join(alts) + ")"
+        return f"(?:{body})?" if "" in node else body
+
+    return emit(trie)
+
+
+class CommandRegistry:
+    """Voice intents matched by a precompiled regex instead of a chain of `in` checks.
+
+    Keywords match whole words only ("hi" no longer fires on "this"). All keywords
+    of all intents are compiled into one trie-shaped regex, so dispatch cost depends
+    on the utterance length, not the number of intents. Raw regex `patterns` are
+    also supported. When several intents match, the one registered first wins,
+    like the old if/elif order.
+    """
+
+    def __init__(self):
+        self.intents = []     # (name, handler) in priority order
+        self.keywords = {}    # keyword -> intent index
+        self.patterns = []    # (intent index, raw regex)
+        self._regex = None
+        self._compiled_patterns = None
+
+    def register(self, *keywords, patterns=(), name=None):
+        def decorator(handler):
+            index = len(self.intents)
+            self.intents.append((name or handler.__name__, handler))
+            for keyword in keywords:
+                self.keywords.setdefault(keyword.lower(), index)
+            self.patterns += [(index, p) for p in patterns]
+            self._regex = self._compiled_patterns = None
+            return handler
+        return decorator
+
+    def compile(self):
+        self._regex = re.compile(r"\b(" + trie_pattern(self.keywords) + r")\b") if self.keywords else None
+        self._compiled_patterns = [(index, re.compile(p)) for index, p in self.patterns]
+        return self._regex
+
+    def match(self, command):
+        # Returns (intent name, handler) or None
+        if self._compiled_patterns is None:
+            self.compile()
+        command = command.lower()
+        best = None
+        if self._regex is not None:
+            for m in self._regex.finditer(command):
+                index = self.keywords[m.group(1)]
+                if best is None or index < best:
+                    best = index
+        for index, pattern in self._compiled_patterns:
+            if (best is None or index < best) and pattern.search(command):
+                best = index
+        if best is None:
+            return None
+        return self.intents[best]
@@ -0,0 +1,201 @@
+import hashlib
+import io
+import math
+import os
+import struct
+import threading
+import time
+import wave
+from collections import OrderedDict
+from pathlib import Path
+
+
+# --- Engines: synthesize(text) -> audio bytes; `name`, `voice` and `ext` go into the cache key ---
+
+class StubEngine:
+    """Offline engine: a short sine beep whose length follows the text. For tests and dry runs."""
+
+    name = "stub"
+    ext = "wav"
+
+    def __init__(self, voice="beep", latency=0.0):
+        self.voice = voice
+        self.latency = latency
+        self.calls = 0
+
+    def synthesize(self, text):
+        self.calls += 1
+        if self.latency:
+            time.sleep(self.latency)
+        rate = 8000
+        frames = int(rate * min(0.05 * len(text), 3.0))
+        samples = b"".join(struct.pack("<h", int(8000 * math.sin(2 * math.pi * 440 * i / rate))) for i in range(frames))
+        buf = io.BytesIO()
+        with wave.open(buf, "wb") as w:
+            w.setnchannels(1)
+            w.setsampwidth(2)
+            w.setframerate(rate)
+            w.writeframes(samples)
+        return buf.getvalue()
+
+
+class ElevenLabsEngine:
+    name = "elevenlabs"
+    ext = "mp3"
+
+    def __init__(self, voice=None, model="eleven_multilingual_v2"):
+        from elevenlabs.client import ElevenLabs
+
+        self.client = ElevenLabs(api_key=os.environ["ELEVENLABS_API_KEY"])
+        self.voice = voice or os.environ.get("ELEVENLABS_VOICE_ID", "JBFqnCBsd6RMkjVDRZzb")
+        self.model = model
+
+    def synthesize(self, text):
+        chunks = self.client.text_to_speech.convert(voice_id=self.voice, text=text, model_id=self.model)
+        return b"".join(chunks)
+
+
+class GTTSEngine:
+    name = "gtts"
+    ext = "mp3"
+
+    def __init__(self, voice="en"):
+        from gtts import gTTS
+
+        self.gTTS = gTTS
+        self.voice = voice
+
+    def synthesize(self, text):
+        buf = io.BytesIO()
+        self.gTTS(text=text, lang=self.voice).write_to_fp(buf)
+        return buf.getvalue()
+
+
+class Pyttsx3Engine:
+    name = "pyttsx3"
+    ext = "wav"
+
+    def __init__(self, voice="default"):
+        import pyttsx3
+
+        self.engine = pyttsx3.init()
+        self.voice = voice
+        self.tmp_dir = Path(".tts_tmp")
+        self.tmp_dir.mkdir(exist_ok=True)
+
+    def synthesize(self, text):
+        # pyttsx3 can only render to a file
+        path = self.tmp_dir / f"{threading.get_ident()}.wav"
+        self.engine.save_to_file(text, str(path))
+        self.engine.runAndWait()
+        data = path.read_bytes()
+        path.unlink()
+        return data
+
+
+ENGINES = {"elevenlabs": ElevenLabsEngine, "gtts": GTTSEngine, "pyttsx3": Pyttsx3Engine, "stub": StubEngine}
+
+
+def engine_from_env(preferred=None):
+    # JARVIS_TTS picks the engine; otherwise try them in requirements.txt order
+    order = [preferred or os.environ.get("JARVIS_TTS", "elevenlabs"), "elevenlabs", "gtts", "pyttsx3"]
+    for name in dict.fromkeys(order):
+        try:
+            return ENGINES[name]()
+        except Exception as e:
+            print(f"[TTS] {name} unavailable: {e}")
+    return StubEngine()
+
+
+# --- Cache ---
+
+class TtsCache:
+    """Audio files on disk keyed by hash(engine, voice, text), evicted least-recently-used past `max_bytes`."""
+
+    def __init__(self, folder="voice_cache", max_bytes=50 * 1024 * 1024):
+        self.folder = Path(folder)
+        self.folder.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        # Oldest access first; file mtimes carry the order across runs
+        files = sorted(self.folder.glob("*.*"), key=lambda p: p.stat().st_mtime)
+        self.entries = OrderedDict((p.name, p.stat().st_size) for p in files)
+        self.total = sum(self.entries.values())
+
+    @staticmethod
+    def key(engine, text):
+        raw = f"{engine.name}\0{engine.voice}\0{text.strip()}".encode("utf-8")
+        return f"{engine.name}-{hashlib.sha256(raw).hexdigest()[:24]}.{engine.ext}"
+
+    def get(self, engine, text):
+        name = self.key(engine, text)
+        with self.lock:
+            if name not in self.entries:
+                self.misses += 1
+                return None
+            self.entries.move_to_end(name)
+            self.hits += 1
+        path = self.folder / name
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            # Evicted by another thread's put (or deleted by hand) since the lookup: a miss
+            with self.lock:
+                if not path.exists():  # unless a put has just written it again
+                    self.total -= self.entries.pop(name, 0)
+                self.hits -= 1
+                self.misses += 1
+            return None
+        return path
+
+    def put(self, engine, text, audio):
+        name = self.key(engine, text)
+        path = self.folder / name
+        tmp = path.with_suffix(".part")
+        tmp.write_bytes(audio)
+        tmp.replace(path)
+        with self.lock:
+            self.total += len(audio) - self.entries.pop(name, 0)
+            self.entries[name] = len(audio)
+            while self.total > self.max_bytes and len(self.entries) > 1:
+                old, size = self.entries.popitem(last=False)
+                self.total -= size
+                (self.folder / old).unlink(missing_ok=True)
+        return path
+
+
+class CachedSpeaker:
+    """Synthesize once per (engine, voice, text), then replay the cached file."""
+
+    def __init__(self, engine, cache, play=None):
+        self.engine = engine
+        self.cache = cache
+        self.play = play or play_file
+        self.synth_lock = threading.Lock()  # engines aren't thread-safe
+
+    def audio_for(self, text):
+        path = self.cache.get(self.engine, text)
+        if path is None:
+            with self.synth_lock:
+                path = self.cache.get(self.engine, text)
+                if path is None:
+                    path = self.cache.put(self.engine, text, self.engine.synthesize(text))
+        return path
+
+    def say(self, text):
+        print(f"[Jarvis] {text}")
+        self.play(self.audio_for(text))
+
+    def prewarm(self, phrases):
+        # Fill the cache for fixed phrases in the background so first use plays at once
+        thread = threading.Thread(target=lambda: [self.audio_for(p) for p in phrases], daemon=True)
+        thread.start()
+        return thread
+
+
+def play_file(path):
+    from playsound import playsound
+
+    playsound(str(path))
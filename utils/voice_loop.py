@@ -0,0 +1,363 @@
+import json
+import queue
+import threading
+import time
+import wave
+
+RATE = 16000
+CHUNK = 1600  # 0.1 s of 16-bit mono audio per queue item
+
+
+# --- Audio sources: iterate over raw 16 kHz mono int16 chunks ---
+
+class MicSource:
+    def __init__(self, rate=RATE, chunk=CHUNK, device=None):
+        self.rate = rate
+        self.chunk = chunk
+        self.device = device
+        self.chunks = queue.Queue()
+        self.running = threading.Event()
+
+    def __iter__(self):
+        import sounddevice as sd
+
+        def callback(data, frames, t, status):
+            self.chunks.put(bytes(data))
+
+        self.running.set()
+        with sd.RawInputStream(samplerate=self.rate, blocksize=self.chunk, dtype="int16",
+                               channels=1, device=self.device, callback=callback):
+            while self.running.is_set():
+                try:
+                    yield self.chunks.get(timeout=0.5)
+                except queue.Empty:
+                    continue
+
+    def close(self):
+        self.running.clear()
+
+
+class WavSource:
+    """Plays WAV files (16 kHz mono int16) in place of the microphone, at real-time pace by default."""
+
+    def __init__(self, paths, chunk=CHUNK, gap=1.0, realtime=True):
+        self.paths = list(paths)
+        self.chunk = chunk
+        self.gap = gap
+        self.realtime = realtime
+        self.running = threading.Event()
+
+    def _chunks(self):
+        silence = bytes(2 * self.chunk)
+        for path in self.paths:
+            with wave.open(str(path), "rb") as w:
+                if (w.getframerate(), w.getnchannels(), w.getsampwidth()) != (RATE, 1, 2):
+                    raise ValueError(f"{path}: expected 16 kHz mono 16-bit audio")
+                while data := w.readframes(self.chunk):
+                    yield data
+            for _ in range(int(self.gap * RATE / self.chunk)):
+                yield silence
+
+    def __iter__(self):
+        self.running.set()
+        next_at = time.monotonic()
+        for data in self._chunks():
+            if not self.running.is_set():
+                return
+            if self.realtime:
+                next_at += len(data) / 2 / RATE
+                time.sleep(max(0, next_at - time.monotonic()))
+            yield data
+
+    def close(self):
+        self.running.clear()
+
+
+class EchoSource:
+    """Mixes whatever `player` is playing back into `source` at `gain`, like a microphone
+    next to the speakers. For fixture runs (needs a player that sets `playing`, e.g. SilentPlayer)."""
+
+    def __init__(self, source, player, gain=0.2):
+        self.source = source
+        self.player = player
+        self.gain = gain
+
+    def __iter__(self):
+        import numpy as np
+
+        for chunk in self.source:
+            clip = self.player.playing
+            if clip is not None:
+                samples, rate, started = clip
+                mic = np.frombuffer(chunk, dtype=np.int16).astype(np.float32)
+                # Seconds into the clip for each sample of this chunk, which has just been captured
+                t = time.monotonic() - started - (mic.size - np.arange(mic.size)) / RATE
+                echo = np.interp(t * rate, np.arange(samples.size), samples, left=0, right=0)
+                chunk = np.clip(mic + self.gain * echo, -32768, 32767).astype(np.int16).tobytes()
+            yield chunk
+
+    def close(self):
+        self.source.close()
+
+
+def loudness(chunk):
+    import numpy as np
+
+    samples = np.frombuffer(chunk, dtype=np.int16).astype(np.float32)
+    return float(np.sqrt(np.mean(samples ** 2))) if samples.size else 0.0
+
+
+# --- Recognizers: feed(chunk) -> ("partial" | "final", text) ---
+
+class VoskStream:
+    def __init__(self, model_path="model", rate=RATE):
+        from vosk import KaldiRecognizer, Model
+
+        self.recognizer = KaldiRecognizer(Model(model_path), rate)
+
+    def feed(self, chunk):
+        if self.recognizer.AcceptWaveform(chunk):
+            return "final", json.loads(self.recognizer.Result()).get("text", "")
+        return "partial", json.loads(self.recognizer.PartialResult()).get("partial", "")
+
+
+class ScriptedRecognizer:
+    """Offline stand-in for Vosk: each burst of sound in the input is heard as the next
+    transcript, revealed one word per `word_chunks` loud chunks, and finalized after
+    `end_chunks` quiet chunks (roughly Vosk's endpointing)."""
+
+    def __init__(self, transcripts, threshold=500, word_chunks=2, end_chunks=5):
+        self.transcripts = list(transcripts)
+        self.threshold = threshold
+        self.word_chunks = word_chunks
+        self.end_chunks = end_chunks
+        self.loud = 0
+        self.quiet = 0
+
+    def feed(self, chunk):
+        if not self.transcripts:
+            return "partial", ""
+        words = self.transcripts[0].split()
+        if loudness(chunk) > self.threshold:
+            self.loud += 1
+            self.quiet = 0
+        elif self.loud:
+            self.quiet += 1
+            if self.quiet >= self.end_chunks:
+                self.loud = self.quiet = 0
+                return "final", self.transcripts.pop(0)
+        heard = min(len(words), -(-self.loud // self.word_chunks))
+        return "partial", " ".join(words[:heard])
+
+
+# --- Playback ---
+
+class SoundDevicePlayer:
+    def play(self, path, stop):
+        import numpy as np
+        import sounddevice as sd
+        from pydub import AudioSegment
+
+        audio = AudioSegment.from_file(path)
+        samples = np.array(audio.get_array_of_samples()).reshape(-1, audio.channels)
+        sd.play(samples, audio.frame_rate)
+        if stop.wait(len(audio) / 1000):
+            sd.stop()  # barge-in
+
+
+class SilentPlayer:
+    """Waits out the clip's length without a sound card; for WAV fixture runs."""
+
+    def __init__(self):
+        self.played = []
+        self.playing = None  # (samples, rate, started) of the clip being "played", for EchoSource
+
+    def play(self, path, stop):
+        import numpy as np
+
+        try:
+            with wave.open(str(path), "rb") as w:
+                rate = w.getframerate()
+                samples = np.frombuffer(w.readframes(w.getnframes()), dtype=np.int16).astype(np.float32)
+        except (wave.Error, EOFError):
+            rate, samples = RATE, np.zeros(RATE // 2, dtype=np.float32)
+        self.played.append(path)
+        self.playing = (samples, rate, time.monotonic())
+        try:
+            return stop.wait(samples.size / rate)
+        finally:
+            self.playing = None
+
+
+# --- Pipeline ---
+
+class VoiceLoop:
+    """Capture, recognition, command handling and playback on separate threads.
+
+    The microphone keeps being read while Jarvis thinks or speaks. A partial result
+    that matches the same intent `confirm` times in a row is dispatched without
+    waiting for Vosk's final result, and speech from a new utterance interrupts
+    the reply being played (barge-in).
+
+    The microphone also picks up Jarvis's own voice. While a reply plays (and for
+    `echo_tail` seconds after), input no louder than `echo_threshold` is passed to
+    the recognizer as silence, so only someone speaking over the reply counts.
+    """
+
+    def __init__(self, source, recognizer, dispatch, match, speaker, player=None,
+                 early=True, confirm=2, barge_in=True, threshold=500, echo_threshold=2000, echo_tail=0.3):
+        self.source = source
+        self.recognizer = recognizer
+        self.dispatch = dispatch      # command text -> False to stop, like process_command
+        self.match = match            # command text -> match or None, like commands.match
+        self.speaker = speaker        # CachedSpeaker, for audio_for()
+        self.player = player or SoundDevicePlayer()
+        self.early = early
+        self.confirm = confirm
+        self.barge_in = barge_in
+        self.threshold = threshold
+        self.echo_threshold = echo_threshold
+        self.echo_tail = echo_tail
+
+        self.commands = queue.Queue()
+        self.replies = queue.Queue()
+        self.stop_playback = threading.Event()
+        self.done = threading.Event()
+        self.utterance = 0            # id of the utterance being heard
+        self.answering = None         # id of the utterance whose reply is playing
+        self.playing = False          # a reply is playing (also ones queued outside a command)
+        self.echo_until = 0.0         # end of the last reply plus echo_tail
+        self.current = None           # utterance id the command worker is handling
+        self.records = []             # one dict per handled utterance
+        self.interruptions = 0
+
+    # Called by command handlers instead of playing audio themselves
+    def say(self, text):
+        print(f"[Jarvis] {text}")
+        self.replies.put((self.current, text))
+
+    def run(self):
+        workers = [
+            threading.Thread(target=self._handle_commands, daemon=True),
+            threading.Thread(target=self._play_replies, daemon=True),
+        ]
+        for worker in workers:
+            worker.start()
+        try:
+            self._listen()
+        finally:
+            self.source.close()
+            self.commands.put(None)
+            workers[0].join()
+            self.replies.put(None)
+            workers[1].join()
+
+    def stop(self):
+        self.done.set()
+        self.source.close()
+
+    def _listen(self):
+        record = None
+        last_intent, repeats = None, 0
+        for chunk in self.source:
+            if self.done.is_set():
+                break
+            now = time.monotonic()
+            level = loudness(chunk)
+            if (self.playing or now < self.echo_until) and level <= self.echo_threshold:
+                chunk = bytes(len(chunk))  # our own reply coming back through the mic
+                level = 0.0
+            if level > self.threshold:
+                if record is None:
+                    record = {"id": self.utterance, "text": None, "early": False, "speech_end": now}
+                record["speech_end"] = now
+            kind, text = self.recognizer.feed(chunk)
+
+            if kind == "partial" and text:
+                # Replies with no utterance (the startup greeting) can be interrupted by anything
+                if self.barge_in and self.playing and (self.answering is None or self.answering < self.utterance):
+                    self._interrupt()
+                if self.early and record is not None and record["text"] is None:
+                    matched = self.match(text)
+                    intent = matched[0] if matched else None
+                    repeats = repeats + 1 if intent and intent == last_intent else 1
+                    last_intent = intent
+                    if intent and repeats >= self.confirm:
+                        self._submit(record, text, early=True)
+
+            elif kind == "final":
+                if text:
+                    record = record or {"id": self.utterance, "text": None, "early": False, "speech_end": now}
+                    if record["text"] is None:
+                        self._submit(record, text, early=False)
+                    print(f"[You said] → {text}")
+                record = None
+                last_intent, repeats = None, 0
+                self.utterance += 1
+
+    def _submit(self, record, text, early):
+        record.update(text=text, early=early, dispatched=time.monotonic())
+        self.records.append(record)
+        self.commands.put(record)
+
+    def _interrupt(self):
+        self.interruptions += 1
+        self.stop_playback.set()
+        while True:
+            try:
+                self.replies.get_nowait()
+            except queue.Empty:
+                break
+
+    # Both workers log a failed command or reply and carry on; a dead worker
+    # would leave Jarvis transcribing but never answering
+    def _handle_commands(self):
+        while (record := self.commands.get()) is not None:
+            self.current = record["id"]
+            try:
+                result = self.dispatch(record["text"])
+            except Exception as e:
+                print(f"[ERROR] Command {record['text']!r} failed: {e}")
+                continue
+            if result is False:
+                self.stop()
+
+    def _play_replies(self):
+        while (item := self.replies.get()) is not None:
+            utterance, text = item
+            try:
+                path = self.speaker.audio_for(text)
+            except Exception as e:
+                print(f"[ERROR] Could not synthesize {text!r}: {e}")
+                continue
+            self.stop_playback.clear()
+            self.answering = utterance
+            for record in self.records:
+                if record["id"] == utterance and "replied" not in record:
+                    record["replied"] = time.monotonic()
+            self.playing = True
+            try:
+                self.player.play(path, self.stop_playback)
+            except Exception as e:
+                print(f"[ERROR] Playback failed: {e}")
+            finally:
+                self.echo_until = time.monotonic() + self.echo_tail
+                self.playing = False
+                self.answering = None
+
+    def latency_report(self):
+        # Speech end -> first reply starts playing, in ms
+        def summary(values):
+            values = sorted(values)
+            if not values:
+                return {}
+            pick = lambda q: values[min(len(values) - 1, int(q * len(values)))]
+            return {"n": len(values), "p50": round(pick(0.5) * 1000), "p95": round(pick(0.95) * 1000)}
+
+        replied = [r for r in self.records if "replied" in r]
+        return {
+            "reply": summary([r["replied"] - r["speech_end"] for r in replied]),
+            "dispatch": summary([r["dispatched"] - r["speech_end"] for r in self.records]),
+            "early": sum(r["early"] for r in self.records),
+            "interruptions": self.interruptions,
+        }